@@ -0,0 +1,310 @@
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+# ==================== GENERASI LEXER/PARSER ====================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Fitur bahasa yang dibutuhkan korpus dan didukung generasi
+FEATURE_FLOAT = 'float'
+FEATURE_IDENTIFIER = 'identifier'
+
+
+def load_generation(number):
+    """Muat 'Pertemuan N - Teori Otomata.py' sebagai modul"""
+    path = os.path.join(BASE_DIR, f"Pertemuan {number} - Teori Otomata.py")
+    spec = importlib.util.spec_from_file_location(f"pertemuan_{number}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def count_tokens(module, text):
+    """Jumlah token dari FastLexer sampai EOF atau karakter tidak valid"""
+    lexer = module.FastLexer(text)
+    count = 0
+    try:
+        while True:
+            token = lexer.get_next_token()
+            if token.type == 'EOF' or token.type == 'ERROR':
+                return count
+            count += 1
+    except module.LexerError:
+        return count
+
+
+def parse_validator(module, text):
+    """Pertemuan 10: validasi lewat kanal result code"""
+    result = module.check_expression(text)
+    return result if result.valid else None
+
+
+def parse_ast(module, text):
+    """Pertemuan 11: AST ekspresi; token sisa dianggap error"""
+    try:
+        # Parser membaca token pertama saat dibuat, jadi ikut di dalam try
+        parser = module.Parser(module.FastLexer(text))
+        ast = parser.parse()
+        if parser.current_token.type != 'EOF':
+            return None
+    except (module.LexerError, module.ParseError):
+        return None
+    return ast
+
+
+def parse_statement(module, text):
+    """Pertemuan 12: AST statement (assignment atau ekspresi)"""
+    try:
+        return module.parse_text(text)
+    except (module.LexerError, module.ParseError):
+        return None
+
+
+def tokenize(module, text):
+    """List token Pertemuan 9; None jika ada karakter tidak valid"""
+    try:
+        return module.tokenize_expression(text)
+    except module.LexerError:
+        return None
+
+
+# parse None berarti generasi itu hanya punya lexer
+Generation = namedtuple('Generation', ('name', 'number', 'features', 'parse'))
+
+GENERATIONS = (
+    Generation('P9 tokenizer', 9, frozenset(), None),
+    Generation('P10 validator', 10, frozenset(), parse_validator),
+    Generation('P11 AST', 11, frozenset({FEATURE_FLOAT}), parse_ast),
+    Generation('P12 assignment', 12, frozenset({FEATURE_FLOAT, FEATURE_IDENTIFIER}),
+               parse_statement),
+)
+
+
+# ==================== KORPUS SINTETIS ====================
+
+def flat_sums(rng, count, terms=200):
+    """Penjumlahan datar yang panjang: '12 + 7 - 30 + ...'"""
+    return [" ".join(f"{rng.randint(0, 999)} {rng.choice('+-')}" for _ in range(terms - 1))
+            + f" {rng.randint(0, 999)}" for _ in range(count)]
+
+
+def deep_nesting(rng, count, depth=100):
+    """Kurung bersarang: '((1 + 2) * 3) - 4 ...' sedalam depth"""
+    texts = []
+    for _ in range(count):
+        tail = "".join(f" {rng.choice('+-*/')} {rng.randint(1, 99)})" for _ in range(depth))
+        texts.append("(" * depth + str(rng.randint(0, 99)) + tail)
+    return texts
+
+
+def identifier_heavy(rng, count, terms=60):
+    """Assignment dengan banyak identifier: 'total_3 = harga_1 * qty + ...'"""
+    names = [f"{prefix}_{i}" for prefix in ('harga', 'qty', 'pajak', 'diskon') for i in range(25)]
+    return [f"total_{i} = " + " ".join(f"{rng.choice(names)} {rng.choice('+-*/')}"
+                                       for _ in range(terms - 1)) + f" {rng.choice(names)}"
+            for i in range(count)]
+
+
+def float_heavy(rng, count, terms=100):
+    """Ekspresi dengan banyak float: '3.14 * 2.5 + 0.125 ...'"""
+    return [" ".join(f"{rng.uniform(0, 1000):.3f} {rng.choice('+-*/')}" for _ in range(terms - 1))
+            + f" {rng.uniform(1, 10):.2f}" for _ in range(count)]
+
+
+def invalid_inputs(rng, count, terms=40):
+    """Ekspresi yang rusak di posisi acak (syntax maupun karakter asing)"""
+    breaks = (" + * ", " (", " )", " $ ", " 1 2 ", "()")
+    texts = []
+    for _ in range(count):
+        text = " + ".join(f"({rng.randint(0, 999)} * {rng.randint(1, 99)})" for _ in range(terms))
+        position = rng.randint(0, len(text))
+        texts.append(text[:position] + rng.choice(breaks) + text[position:])
+    return texts
+
+
+Corpus = namedtuple('Corpus', ('name', 'features', 'generate'))
+
+CORPORA = (
+    Corpus('flat', frozenset(), flat_sums),
+    Corpus('nested', frozenset(), deep_nesting),
+    Corpus('identifier', frozenset({FEATURE_IDENTIFIER}), identifier_heavy),
+    Corpus('float', frozenset({FEATURE_FLOAT}), float_heavy),
+    Corpus('invalid', frozenset(), invalid_inputs),
+)
+
+
+# ==================== PENGUKURAN ====================
+
+def best_time(run, repeat):
+    """Waktu tercepat dari beberapa kali run()"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# Frame tracemalloc sendiri tidak ikut dihitung
+TRACEMALLOC_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+
+def measure_memory(run):
+    """Memori puncak (byte) selama run() dan jumlah blok memori baru yang
+    masih hidup dipegang hasilnya (selisih snapshot tracemalloc sebelum dan
+    sesudah). Ini bukan jumlah alokasi: blok sementara yang sudah
+    dibebaskan selama run() tidak terlihat di snapshot"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+    results = run()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+    tracemalloc.stop()
+    del results
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    return peak, blocks
+
+
+def measure(generation, module, texts, repeat):
+    """Satu baris hasil benchmark untuk satu generasi dan satu korpus"""
+    tokens = sum(count_tokens(module, text) for text in texts)
+    lex_time = best_time(lambda: [count_tokens(module, text) for text in texts], repeat)
+    row = {
+        'inputs': len(texts),
+        'tokens': tokens,
+        'tokens_per_sec': tokens / lex_time,
+        'parses_per_sec': None,
+        'valid': None,
+    }
+    
+    if generation.parse is None:
+        # Hanya lexer: memori diukur untuk list token
+        run = lambda: [tokenize(module, text) for text in texts]
+    else:
+        parse = generation.parse
+        run = lambda: [parse(module, text) for text in texts]
+        parse_time = best_time(run, repeat)
+        row['parses_per_sec'] = len(texts) / parse_time
+        row['valid'] = sum(result is not None for result in run())
+    
+    row['peak_bytes'], row['live_blocks'] = measure_memory(run)
+    return row
+
+
+def run_suite(count=1000, repeat=3, seed=0):
+    """Jalankan semua korpus yang didukung pada setiap generasi"""
+    corpora = {corpus.name: corpus.generate(random.Random(seed), count) for corpus in CORPORA}
+    results = []
+    
+    print(f"{'implementasi':<16}{'korpus':<12}{'token/detik':>13}{'parse/detik':>13}"
+          f"{'valid':>8}{'memori':>11}{'blok hidup':>12}")
+    for generation in GENERATIONS:
+        module = load_generation(generation.number)
+        for corpus in CORPORA:
+            if not corpus.features <= generation.features:
+                continue
+            row = dict(implementation=generation.name, corpus=corpus.name,
+                       **measure(generation, module, corpora[corpus.name], repeat))
+            results.append(row)
+            
+            parses = row['parses_per_sec']
+            parses = f"{parses:13.0f}" if parses is not None else f"{'-':>13}"
+            valid = row['valid'] if row['valid'] is not None else '-'
+            print(f"{generation.name:<16}{corpus.name:<12}{row['tokens_per_sec']:13.0f}{parses}"
+                  f"{valid:>8}{row['peak_bytes'] / 1024 / 1024:9.2f}MB{row['live_blocks']:>12}")
+    return results
+
+
+# ==================== PERBANDINGAN ====================
+
+# Penurunan throughput lebih dari ini dianggap regresi
+REGRESSION_THRESHOLD = 0.10
+
+# Best-of-1 terlalu berisik untuk gate 10%; --compare butuh minimal ini
+MIN_COMPARE_REPEAT = 3
+
+
+def save_results(results, path, count, repeat):
+    """Simpan hasil sebagai JSON beserta info lingkungan"""
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'count': count,
+        'repeat': repeat,
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nHasil disimpan ke {path}")
+
+
+def compare_results(results, path, threshold=REGRESSION_THRESHOLD):
+    """Bandingkan hasil sekarang dengan file JSON run sebelumnya;
+    kembalikan daftar (implementasi, korpus, metrik) yang regresi"""
+    with open(path) as file:
+        report = json.load(file)
+    previous = {(row['implementation'], row['corpus']): row for row in report['results']}
+    
+    print(f"\nPerbandingan dengan {path} (rasio sekarang/sebelumnya):")
+    if report.get('repeat', 1) < MIN_COMPARE_REPEAT:
+        print(f"  Peringatan: baseline hanya best of {report.get('repeat', 1)}, "
+              f"rasio bisa berisik")
+    regressions = []
+    for row in results:
+        old = previous.get((row['implementation'], row['corpus']))
+        if old is None:
+            continue
+        ratios = []
+        for metric in ('tokens_per_sec', 'parses_per_sec'):
+            if row[metric] is None or not old.get(metric):
+                continue
+            ratio = row[metric] / old[metric]
+            ratios.append(f"{metric.split('_')[0]} {ratio:5.2f}x")
+            if ratio < 1 - threshold:
+                regressions.append((row['implementation'], row['corpus'], metric))
+        memory = row['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1
+        ratios.append(f"memori {memory:5.2f}x")
+        print(f"  {row['implementation']:<16}{row['corpus']:<12}{'   '.join(ratios)}")
+    
+    for implementation, corpus, metric in regressions:
+        print(f"  REGRESI: {implementation} / {corpus} ({metric})")
+    return regressions
+
+
+def option_value(name):
+    """Nilai setelah opsi '--name' di sys.argv, atau None"""
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return None
+
+
+if __name__ == "__main__":
+    # Pemakaian: [hasil.json] [--compare lama.json] [--count N] [--repeat N] [--quick]
+    baseline = option_value('--compare')
+    quick = '--quick' in sys.argv
+    count = int(option_value('--count') or (100 if quick else 1000))
+    repeat = int(option_value('--repeat') or (1 if quick and baseline is None else MIN_COMPARE_REPEAT))
+    if baseline is not None and repeat < MIN_COMPARE_REPEAT:
+        sys.exit(f"--compare butuh --repeat minimal {MIN_COMPARE_REPEAT} "
+                 f"agar gate regresi tidak terpicu noise")
+    values = {option_value(name) for name in ('--compare', '--count', '--repeat')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--') and arg not in values]
+    
+    print(f"Benchmark Lexer/Parser: {count} input per korpus, best of {repeat}\n")
+    results = run_suite(count, repeat)
+    if args:
+        save_results(results, args[0], count, repeat)
+    
+    if baseline is not None and compare_results(results, baseline):
+        sys.exit(1)
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+
+# ==================== PARSE CACHE ====================
+# Satu implementasi dipakai bersama Pertemuan 10 (cache validasi) dan
+# Pertemuan 12 (cache AST); yang berbeda hanya size_function
+
+
+class ParseCache:
+    """Cache LRU thread-safe di depan parser: teks ekspresi -> hasil.
+    Exception dari parse_function ikut di-cache (kelas dan argumennya) dan
+    exception baru dilempar saat hit, sehingga thread lain tidak berbagi
+    objek exception yang sama. Batas ukuran berupa jumlah entri (max_size)
+    dan/atau perkiraan byte (max_bytes, dihitung oleh size_function)"""
+    def __init__(self, parse_function, size_function, max_size=4096, max_bytes=None):
+        self.parse_function = parse_function
+        self.size_function = size_function
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # teks -> (hasil, error, ukuran)
+        self.lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, text):
+        """Ambil hasil dari cache, atau parse lalu simpan"""
+        with self.lock:
+            entry = self.entries.get(text)
+            if entry is not None:
+                self.entries.move_to_end(text)
+                self.hits += 1
+        
+        if entry is None:
+            # Parse di luar lock agar thread lain tidak menunggu
+            result, error = None, None
+            try:
+                result = self.parse_function(text)
+            except Exception as e:
+                error = (e.__class__, e.args)
+            entry = (result, error, self.size_function(text, result))
+            self.store(text, entry)
+        
+        result, error, _ = entry
+        if error is not None:
+            error_class, args = error
+            raise error_class(*args)
+        return result
+    
+    def store(self, text, entry):
+        with self.lock:
+            self.misses += 1
+            previous = self.entries.pop(text, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+            self.entries[text] = entry
+            self.total_bytes += entry[2]
+            
+            # Buang entri yang paling lama tidak dipakai
+            while self.entries and (
+                    (self.max_size is not None and len(self.entries) > self.max_size)
+                    or (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted[2]
+                self.evictions += 1
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        """Counter hit/miss/eviction dan ukuran cache saat ini"""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'bytes': self.total_bytes,
+            }
@@ -1,4 +1,20 @@
+import codecs
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+import random
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+
 class Token:
+    __slots__ = ('type', 'value')
+    
     def __init__(self, type, value):
         self.type = type
         self.value = value
@@ -7,12 +23,34 @@ class Token:
         return f"Token({self.type}, '{self.value}')"
 
 
+class LexerError(Exception):
+    """Karakter yang tidak dikenali lexer"""
+
+
+class ParseError(Exception):
+    """Urutan token yang tidak sesuai grammar"""
+
+
+# Jenis error di kanal result code (sama dengan ValidationResult.kind)
+ERROR_LEXER = 'lexer'
+ERROR_SYNTAX = 'syntax'
+
+# Pengganti karakter tidak valid: tipenya tidak cocok dengan rule manapun,
+# sehingga parser berhenti tanpa exception
+ERROR_TOKEN = Token('ERROR', None)
+
+
 class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
+        self.start = 0  # Offset awal token terakhir
         self.current_char = self.text[self.pos] if self.text else None
     
+    def character(self, position):
+        """Karakter di offset position (untuk pesan error)"""
+        return self.text[position]
+    
     def advance(self):
         """Pindah ke karakter berikutnya"""
         self.pos += 1
@@ -42,6 +80,8 @@ class Lexer:
                 self.skip_whitespace()
                 continue
             
+            self.start = self.pos
+            
             # Integer multi-digit
             if self.current_char.isdigit():
                 return self.integer()
@@ -72,26 +112,173 @@ class Lexer:
                 return Token('RPAREN', ')')
             
             # Jika karakter tidak dikenali
-            raise Exception(f"Karakter tidak valid: '{self.current_char}'")
+            return ERROR_TOKEN
         
         # End of file
+        self.start = self.pos
         return Token('EOF', None)
 
 
+# Pola master: lewati spasi, lalu tangkap integer (grup 1) atau operator (grup 2)
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+)|([-+*/()]))')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+OPERATOR_TYPES = {
+    '+': 'PLUS',
+    '-': 'MINUS',
+    '*': 'MUL',
+    '/': 'DIV',
+    '(': 'LPAREN',
+    ')': 'RPAREN',
+}
+
+# Token operator bersifat tetap, jadi cukup satu instance per operator
+OPERATOR_TOKENS = {char: Token(type, char) for char, type in OPERATOR_TYPES.items()}
+
+
+class FastLexer:
+    """Lexer berbasis regex dengan API get_next_token() yang sama"""
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.start = 0  # Offset awal token terakhir
+    
+    def character(self, position):
+        """Karakter di offset position (untuk pesan error)"""
+        return self.text[position]
+    
+    def error(self):
+        """Cari karakter tidak valid setelah spasi (dikembalikan sebagai
+        ERROR_TOKEN dengan start di karakter itu), atau kembalikan EOF"""
+        pos = WHITESPACE_PATTERN.match(self.text, self.pos).end()
+        self.pos = self.start = pos
+        if pos >= len(self.text):
+            return Token('EOF', None)
+        return ERROR_TOKEN
+    
+    def get_next_token(self):
+        """Tokenizer (Lexical Analyzer) dengan satu regex match per token"""
+        match = TOKEN_PATTERN.match(self.text, self.pos)
+        if match is None:
+            return self.error()
+        
+        self.start = match.start(match.lastindex)
+        self.pos = match.end()
+        number, operator = match.groups()
+        if number is not None:
+            return Token('INT', int(number))
+        return OPERATOR_TOKENS[operator]
+
+
+# Ukuran chunk default untuk streaming (64 KB)
+CHUNK_SIZE = 1 << 16
+
+
+class StreamLexer:
+    """Lexer streaming dari file object (teks/biner) atau mmap: input dibaca
+    per chunk dan token dihasilkan secara lazy dengan memori konstan"""
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.tokens = self.scan(source, chunk_size)
+        self.start = 0          # Offset global awal token terakhir
+        self.invalid = None     # Karakter tidak valid (teks tidak disimpan)
+    
+    def character(self, position):
+        """Karakter tidak valid di offset position (untuk pesan error)"""
+        return self.invalid
+    
+    def scan(self, source, chunk_size):
+        """Generator token; lexeme yang terpotong di batas chunk disambung.
+        Karakter tidak valid menghasilkan ERROR_TOKEN terus-menerus,
+        sama seperti FastLexer"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        offset = 0      # Offset global awal buffer
+        eof = False
+        
+        while not eof:
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk, final=eof)
+            buffer += chunk
+            
+            pos = 0
+            end = len(buffer)
+            while True:
+                match = TOKEN_PATTERN.match(buffer, pos)
+                if match is None:
+                    pos = WHITESPACE_PATTERN.match(buffer, pos).end()
+                    self.start = offset + pos
+                    if pos < end:
+                        self.invalid = buffer[pos]
+                        while True:
+                            yield ERROR_TOKEN
+                    break
+                
+                # Integer di akhir buffer mungkin berlanjut di chunk berikutnya
+                if match.end() == end and not eof:
+                    break
+                
+                self.start = offset + match.start(match.lastindex)
+                pos = match.end()
+                number, operator = match.groups()
+                if number is not None:
+                    yield Token('INT', int(number))
+                else:
+                    yield OPERATOR_TOKENS[operator]
+            
+            offset += pos
+            buffer = buffer[pos:]
+    
+    def get_next_token(self):
+        return next(self.tokens, None) or Token('EOF', None)
+
+
 class Parser:
     def __init__(self, lexer):
         self.lexer = lexer
+        # Error pertama: jenis, offset, token, dan (pesan, tipe yang diharapkan)
+        self.error_kind = None
+        self.error_position = None
+        self.error_token = None
+        self.error_detail = None
         self.current_token = self.lexer.get_next_token()
     
-    def error(self, message="Syntax error"):
-        raise Exception(f"{message} pada token: {self.current_token}")
+    def error(self, message="Syntax error", expected=None):
+        """Catat error pertama tanpa exception lalu ganti current_token
+        dengan ERROR_TOKEN agar semua rule berhenti; kembalikan False.
+        Pesan baru diformat saat error_message() dipanggil"""
+        if self.error_kind is None:
+            token = self.current_token
+            self.error_kind = ERROR_LEXER if token is ERROR_TOKEN else ERROR_SYNTAX
+            self.error_position = self.lexer.start
+            self.error_token = token
+            self.error_detail = (message, expected)
+            self.current_token = ERROR_TOKEN
+        return False
+    
+    def error_message(self):
+        """Pesan error pertama, atau None jika tidak ada error"""
+        if self.error_kind is None:
+            return None
+        if self.error_kind == ERROR_LEXER:
+            return f"Karakter tidak valid: '{self.lexer.character(self.error_position)}'"
+        message, expected = self.error_detail
+        if expected is not None:
+            message = f"Expected {expected}, got {self.error_token.type}"
+        return f"{message} pada token: {self.error_token}"
+    
+    def exception(self):
+        """Error pertama sebagai LexerError atau ParseError (API publik)"""
+        error_class = LexerError if self.error_kind == ERROR_LEXER else ParseError
+        return error_class(self.error_message())
     
     def eat(self, token_type):
-        """Mengonsumsi token jika sesuai, atau error"""
+        """Mengonsumsi token jika sesuai (True), atau catat error (False)"""
         if self.current_token.type == token_type:
             self.current_token = self.lexer.get_next_token()
-        else:
-            self.error(f"Expected {token_type}, got {self.current_token.type}")
+            return True
+        return self.error(expected=token_type)
     
     def factor(self):
         """factor : INT | LPAREN expr RPAREN"""
@@ -105,11 +292,9 @@ class Parser:
             # Parse ekspresi di dalam kurung
             if not self.expr():
                 return False
-            self.eat('RPAREN')
-            return True
+            return self.eat('RPAREN')
         else:
-            self.error("Expected INT or LPAREN")
-            return False
+            return self.error("Expected INT or LPAREN")
     
     def term(self):
         """term : factor ((MUL | DIV) factor)*"""
@@ -139,37 +324,494 @@ class Parser:
         
         return True
     
+    def check(self):
+        """Parse tanpa exception dan tanpa print; True jika valid.
+        Error pertama tersimpan di error_kind dan error_position"""
+        self.expr()
+        # Pastikan semua token sudah diproses
+        if self.current_token.type != 'EOF':
+            self.error("Unexpected tokens at the end")
+        return self.error_kind is None
+    
     def parse(self):
-        """Mulai parsing dari root grammar (expr)"""
-        try:
-            result = self.expr()
-            # Pastikan semua token sudah diproses
-            if self.current_token.type != 'EOF':
-                self.error("Unexpected tokens at the end")
-                return False
-            return result
-        except Exception as e:
-            print(f"Parsing error: {e}")
-            return False
+        """Mulai parsing dari root grammar (expr); error dicetak"""
+        if self.check():
+            return True
+        print(f"Parsing error: {self.error_message()}")
+        return False
+
+
+BINARY_PRECEDENCE = {'PLUS': 1, 'MINUS': 1, 'MUL': 2, 'DIV': 2}
+
+
+class IterativeParser(Parser):
+    """Parser tanpa rekursi: '(' dan operator biner disimpan di stack
+    eksplisit sehingga kurung sedalam apapun tidak memicu RecursionError"""
+    
+    def expr(self):
+        # Hanya presedensi yang perlu disimpan karena tidak ada AST
+        stack = []
+        
+        while True:
+            token = self.current_token
+            if token.type == 'LPAREN':
+                self.eat('LPAREN')
+                stack.append(None)
+                continue
+            if token.type != 'INT':
+                return self.error("Expected INT or LPAREN")
+            self.eat('INT')
+            
+            while True:
+                precedence = BINARY_PRECEDENCE.get(self.current_token.type)
+                if precedence is not None:
+                    while stack and stack[-1] is not None and stack[-1] >= precedence:
+                        stack.pop()
+                    self.eat(self.current_token.type)
+                    stack.append(precedence)
+                    break
+                
+                while stack and stack[-1] is not None:
+                    stack.pop()
+                
+                if not stack:
+                    return True
+                if not self.eat('RPAREN'):
+                    return False
+                stack.pop()
 
 
 def validate_expression(expression):
     """Fungsi untuk memvalidasi ekspresi aritmatika"""
     print(f"Validasi: '{expression}'")
     
+    parser = Parser(FastLexer(expression))
+    if parser.check():
+        print("✅ Valid\n")
+        return True
+    print(f"❌ Invalid - Error: {parser.error_message()}\n")
+    return False
+
+
+def parse_expression(expression):
+    """Validasi tanpa print; error dilempar sebagai LexerError/ParseError"""
+    parser = Parser(FastLexer(expression))
+    if not parser.check():
+        raise parser.exception()
+    return True
+
+
+# ==================== BATCH VALIDATION ====================
+
+# Hasil ringkas per ekspresi: valid, offset error, dan jenis error
+# (None, 'lexer', 'syntax') - tanpa pesan agar murah dikirim antar proses
+ValidationResult = namedtuple('ValidationResult', ('valid', 'position', 'kind'))
+
+VALID_RESULT = ValidationResult(True, None, None)
+
+# Jumlah ekspresi per batch yang dikirim ke satu worker
+BATCH_SIZE = 2048
+
+
+def check_expression(expression):
+    """Validasi tanpa print dan tanpa exception; kembalikan ValidationResult"""
+    parser = Parser(FastLexer(expression))
     try:
-        lexer = Lexer(expression)
-        parser = Parser(lexer)
-        
-        if parser.parse():
-            print("✅ Valid\n")
-            return True
-        else:
-            print("❌ Invalid\n")
+        if parser.check():
+            return VALID_RESULT
+    except RecursionError:
+        return ValidationResult(False, parser.lexer.start, ERROR_SYNTAX)
+    return ValidationResult(False, parser.error_position, parser.error_kind)
+
+
+def check_batch(expressions):
+    """Validasi satu batch di dalam worker"""
+    return [check_expression(expression) for expression in expressions]
+
+
+def batched(iterable, size):
+    """Potong iterable menjadi list berukuran maksimal size"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def validate_many(expressions, workers=None, batch_size=BATCH_SIZE):
+    """Validasi banyak ekspresi secara paralel di process pool.
+    Hasil dikembalikan sesuai urutan input sebagai list ValidationResult"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [check_expression(expression) for expression in expressions]
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch_results in executor.map(check_batch, batched(expressions, batch_size)):
+            results.extend(batch_results)
+    return results
+
+
+def benchmark_validate_many(count=200000, worker_counts=(1, 2, 4)):
+    """Bandingkan throughput loop validate_expression() dengan validate_many()"""
+    samples = ["10 + 2 * (5 - 3)", "10 + * ", "((2 + 3) * (4 - 1)) / 2",
+               "10 + (2 * 3", "1 + 2 * 3 - 4 / 2", "10 + ()"]
+    expressions = [samples[i % len(samples)] + f" + {i}" for i in range(count)]
+    print(f"Benchmark validasi: {count} ekspresi, {os.cpu_count()} CPU")
+    
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for expression in expressions:
+            validate_expression(expression)
+    elapsed = time.perf_counter() - start
+    print(f"  {'validate_expression loop':<26} {count / elapsed:12.0f} ekspresi/detik")
+    
+    for workers in worker_counts:
+        start = time.perf_counter()
+        validate_many(expressions, workers=workers)
+        elapsed = time.perf_counter() - start
+        label = f"validate_many(workers={workers})"
+        print(f"  {label:<26} {count / elapsed:12.0f} ekspresi/detik")
+
+
+# ==================== RECOGNIZER ====================
+
+# Kelas karakter
+C_DIGIT, C_SPACE, C_OPERATOR, C_LPAREN, C_RPAREN, C_OTHER = range(6)
+
+# State automaton:
+#   S_OPERAND - menunggu operand (awal, setelah operator, setelah '(')
+#   S_NUMBER  - sedang membaca digit integer
+#   S_AFTER   - operand selesai (setelah spasi atau ')'), menunggu operator/')'
+S_OPERAND, S_NUMBER, S_AFTER, S_REJECT = range(4)
+
+TRANSITIONS = (
+    #  DIGIT      SPACE      OPERATOR    LPAREN     RPAREN    OTHER
+    (S_NUMBER, S_OPERAND, S_REJECT,   S_OPERAND, S_REJECT, S_REJECT),  # S_OPERAND
+    (S_NUMBER, S_AFTER,   S_OPERAND,  S_REJECT,  S_AFTER,  S_REJECT),  # S_NUMBER
+    (S_REJECT, S_AFTER,   S_OPERAND,  S_REJECT,  S_AFTER,  S_REJECT),  # S_AFTER
+)
+
+
+def char_class(char):
+    """Kelas karakter dengan aturan yang sama seperti \\d dan \\s di FastLexer"""
+    if char.isdecimal():
+        return C_DIGIT
+    if char.isspace():
+        return C_SPACE
+    if char in '+-*/':
+        return C_OPERATOR
+    if char == '(':
+        return C_LPAREN
+    if char == ')':
+        return C_RPAREN
+    return C_OTHER
+
+
+# Tabel transisi per state yang sudah dihitung untuk semua karakter ASCII;
+# karakter non-ASCII diklasifikasi dengan char_class() saat dibutuhkan
+STATE_TABLES = tuple(
+    {chr(code): row[char_class(chr(code))] for code in range(128)}
+    for row in TRANSITIONS
+)
+
+
+def recognize(expression):
+    """Recognizer tanpa alokasi token: pushdown automaton dengan tabel state
+    dan penghitung kedalaman kurung. Menerima bahasa yang sama dengan Parser"""
+    state = S_OPERAND
+    depth = 0
+    tables = STATE_TABLES
+    
+    for char in expression:
+        next_state = tables[state].get(char)
+        if next_state is None:
+            next_state = TRANSITIONS[state][char_class(char)]
+        if next_state == S_REJECT:
+            return False
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+        state = next_state
+    
+    return depth == 0 and state != S_OPERAND
+
+
+def verify_recognizer(count=20000, max_length=12, seed=0):
+    """Uji diferensial: recognize() harus sama dengan check_expression()
+    untuk ekspresi acak (termasuk yang tidak valid)"""
+    rng = random.Random(seed)
+    alphabet = "0123456789  +-*/()\t.x\u0663\u00a0"
+    mismatches = []
+    for _ in range(count):
+        expression = "".join(rng.choice(alphabet)
+                             for _ in range(rng.randint(0, max_length)))
+        if recognize(expression) != check_expression(expression).valid:
+            mismatches.append(expression)
+    print(f"Uji diferensial recognizer: {count} ekspresi, {len(mismatches)} beda")
+    return mismatches
+
+
+def benchmark_recognizer(count=200000):
+    """Bandingkan recognize() dengan Lexer/Parser (check_expression)"""
+    samples = ["10 + 2 * (5 - 3)", "10 + * ", "((2 + 3) * (4 - 1)) / 2",
+               "10 + (2 * 3", "1 + 2 * 3 - 4 / 2", "10 + ()"]
+    expressions = [samples[i % len(samples)] + f" + {i}" for i in range(count)]
+    print(f"Benchmark recognizer: {count} ekspresi")
+    
+    results = {}
+    for name, check in (("check_expression", check_expression),
+                        ("recognize", recognize)):
+        start = time.perf_counter()
+        for expression in expressions:
+            check(expression)
+        results[name] = time.perf_counter() - start
+        print(f"  {name:<18} {count / results[name]:12.0f} ekspresi/detik")
+    
+    print(f"  Speedup: {results['check_expression'] / results['recognize']:.1f}x")
+    return results
+
+
+# ==================== VALIDATION CACHE ====================
+
+def result_size(text, result):
+    """Perkiraan byte satu entri cache validasi"""
+    return sys.getsizeof(text) + sys.getsizeof(result)
+
+
+def load_shared(name):
+    """Muat '<name> - Teori Otomata.py' dari folder yang sama, sekali per
+    proses (modul didaftarkan di sys.modules)"""
+    module_name = f"teori_otomata_{name.lower()}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            f"{name} - Teori Otomata.py")
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+# Satu implementasi ParseCache dipakai bersama Pertemuan 10 dan 12
+ParseCache = load_shared("Cache").ParseCache
+
+
+def zipf_workload(formulas, count, exponent=1.1, seed=0):
+    """Urutan permintaan dengan distribusi Zipf atas daftar formula"""
+    rng = random.Random(seed)
+    weights = [1 / rank ** exponent for rank in range(1, len(formulas) + 1)]
+    return rng.choices(formulas, weights=weights, k=count)
+
+
+def benchmark_validation_cache(distinct=2000, requests=200000, max_size=1024):
+    """Bandingkan check_expression() tanpa cache dengan ParseCache (Zipf)"""
+    formulas = [f"(1{i} + 2) * ({i} - 3) / 4 + 5 * {i}" if i % 3 else f"{i} + * {i}"
+                for i in range(distinct)]
+    workload = zipf_workload(formulas, requests)
+    print(f"Benchmark validation cache: {requests} permintaan, {distinct} formula")
+    
+    start = time.perf_counter()
+    for text in workload:
+        check_expression(text)
+    uncached = time.perf_counter() - start
+    print(f"  {'tanpa cache':<12} {requests / uncached:12.0f} validasi/detik")
+    
+    cache = ParseCache(check_expression, result_size, max_size=max_size)
+    start = time.perf_counter()
+    for text in workload:
+        cache.get(text)
+    cached = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"  {'ParseCache':<12} {requests / cached:12.0f} validasi/detik  "
+          f"(hit rate {stats['hits'] / requests:.1%})")
+    return stats
+
+
+# ==================== ERROR RECOVERY ====================
+
+# Satu diagnostik: offset karakter, jenis ('lexer' atau 'syntax') dan pesan
+Diagnostic = namedtuple('Diagnostic', ('position', 'kind', 'message'))
+
+
+class RecoveringLexer(FastLexer):
+    """FastLexer yang tidak berhenti pada karakter tidak valid: karakter
+    dicatat di diagnostics lalu dilewati"""
+    def __init__(self, text):
+        super().__init__(text)
+        self.diagnostics = []
+    
+    def error(self):
+        """Lewati karakter tidak valid sampai ketemu token atau EOF"""
+        text = self.text
+        while True:
+            pos = WHITESPACE_PATTERN.match(text, self.pos).end()
+            self.pos = self.start = pos
+            if pos >= len(text):
+                return Token('EOF', None)
+            if TOKEN_PATTERN.match(text, pos) is not None:
+                return self.get_next_token()
+            self.diagnostics.append(
+                Diagnostic(pos, ERROR_LEXER, f"Karakter tidak valid: '{text[pos]}'"))
+            self.pos = pos + 1
+
+
+class RecoveringParser(Parser):
+    """Parser dengan pemulihan error panic-mode: error() mencatat Diagnostic
+    tanpa melempar, operand yang hilang dianggap ada, dan token sisa
+    disinkronkan di ')' atau EOF. Setiap token dikonsumsi sekali sehingga
+    semua error ditemukan dalam satu pass linear"""
+    def __init__(self, lexer):
+        self.diagnostics = lexer.diagnostics
+        super().__init__(lexer)
+    
+    def error(self, message="Syntax error", expected=None):
+        """Catat error di offset token saat ini (satu per offset)"""
+        position = self.lexer.start
+        diagnostics = self.diagnostics
+        if diagnostics and diagnostics[-1].position == position:
             return False
-    except Exception as e:
-        print(f"❌ Invalid - Error: {e}\n")
+        token = self.current_token
+        if expected is not None:
+            message = f"Expected {expected}, got {token.type}"
+        diagnostics.append(Diagnostic(position, ERROR_SYNTAX, f"{message} pada token: {token}"))
         return False
+    
+    def factor(self):
+        """factor : INT | LPAREN expr RPAREN"""
+        token = self.current_token
+        
+        if token.type == 'INT':
+            self.eat('INT')
+        elif token.type == 'LPAREN':
+            self.eat('LPAREN')
+            self.expr()
+            self.synchronize('RPAREN')
+            self.eat('RPAREN')
+        else:
+            # Operand hilang: laporkan tanpa mengonsumsi token
+            self.error("Expected INT or LPAREN")
+        return True
+    
+    def synchronize(self, closer):
+        """Panic mode: token yang tidak bisa melanjutkan ekspresi dilaporkan
+        sekali, lalu sisa token sampai closer atau EOF di-parse sebagai
+        ekspresi agar error di dalamnya tetap ditemukan"""
+        reported = False
+        while self.current_token.type not in (closer, 'EOF'):
+            if not reported:
+                self.error("Unexpected token")
+                reported = True
+            if self.current_token.type == 'RPAREN':
+                self.eat('RPAREN')
+            else:
+                # Operator tanpa operand kiri dikonsumsi oleh term()/expr()
+                self.expr()
+
+
+def diagnose_expression(expression):
+    """Cari semua error lexer dan syntax dalam satu pass tanpa print.
+    Kembalikan list Diagnostic urut offset (kosong jika valid). Kurung
+    yang melebihi batas rekursi dilaporkan sebagai satu diagnostik di
+    posisi saat itu, dan sisa input tidak diperiksa lagi"""
+    parser = RecoveringParser(RecoveringLexer(expression))
+    try:
+        parser.expr()
+        parser.synchronize('EOF')
+    except RecursionError:
+        parser.diagnostics.append(
+            Diagnostic(parser.lexer.start, ERROR_SYNTAX, "Kurung bersarang terlalu dalam"))
+    parser.diagnostics.sort(key=lambda diagnostic: diagnostic.position)
+    return parser.diagnostics
+
+
+def benchmark_diagnose(sizes=(1000, 10000, 100000)):
+    """Waktu diagnose_expression() per token pada ekspresi panjang yang
+    penuh error; waktu per token harus tetap (linear, bukan kuadratik)"""
+    pattern = "1 + * 2 ) ( 3 # 4 "
+    print("Benchmark diagnose_expression: ekspresi penuh error")
+    for size in sizes:
+        expression = pattern * size
+        tokens = size * 8
+        start = time.perf_counter()
+        diagnostics = diagnose_expression(expression)
+        elapsed = time.perf_counter() - start
+        print(f"  {tokens:>8} token: {len(diagnostics):>7} error   "
+              f"{elapsed / tokens * 1e6:6.2f} us/token")
+
+
+# ==================== ERROR CHANNEL ====================
+
+class RaisingLexer(FastLexer):
+    """FastLexer versi lama yang melempar LexerError (pembanding benchmark)"""
+    def error(self):
+        token = super().error()
+        if token is ERROR_TOKEN:
+            raise LexerError(f"Karakter tidak valid: '{self.text[self.pos]}'")
+        return token
+
+
+class RaisingParser(Parser):
+    """Parser versi lama: setiap error dilempar sebagai ParseError dengan
+    pesan yang langsung diformat. Hanya dipakai sebagai pembanding"""
+    def error(self, message="Syntax error", expected=None):
+        if expected is not None:
+            message = f"Expected {expected}, got {self.current_token.type}"
+        raise ParseError(f"{message} pada token: {self.current_token}")
+
+
+def check_expression_raising(expression):
+    """check_expression() versi lama berbasis try/except"""
+    lexer = RaisingLexer(expression)
+    try:
+        parser = RaisingParser(lexer)
+        parser.expr()
+        if parser.current_token.type != 'EOF':
+            parser.error("Unexpected tokens at the end")
+    except LexerError:
+        return ValidationResult(False, lexer.pos, ERROR_LEXER)
+    except ParseError:
+        return ValidationResult(False, lexer.start, ERROR_SYNTAX)
+    return VALID_RESULT
+
+
+def mixed_corpus(count, seed=0):
+    """Ekspresi acak dengan sekitar sepertiga tidak valid (syntax dan lexer)"""
+    rng = random.Random(seed)
+    broken = (" + * 3", " )", " + (", " $ 2", " 4", " / ")
+    expressions = []
+    for _ in range(count):
+        text = " + ".join(f"({rng.randint(0, 999)} * {rng.randint(1, 99)})"
+                          for _ in range(rng.randint(1, 6)))
+        if rng.random() < 1 / 3:
+            position = rng.randint(0, len(text))
+            text = text[:position] + rng.choice(broken) + text[position:]
+        expressions.append(text)
+    return expressions
+
+
+def benchmark_error_channel(count=200000):
+    """Bandingkan validasi berbasis exception dengan kanal result code pada
+    korpus campuran; hasil keduanya harus sama"""
+    expressions = mixed_corpus(count)
+    print(f"Benchmark kanal error: {count} ekspresi campuran")
+    
+    results = {}
+    for name, check in (("exception", check_expression_raising),
+                        ("result code", check_expression)):
+        start = time.perf_counter()
+        results[name] = [check(expression) for expression in expressions]
+        elapsed = time.perf_counter() - start
+        invalid = sum(not result.valid for result in results[name])
+        print(f"  {name:<12} {count / elapsed:12.0f} ekspresi/detik  ({invalid} tidak valid)")
+    
+    assert results["exception"] == results["result code"]
+    return results
 
 
 # Test cases
@@ -216,4 +858,21 @@ if __name__ == "__main__":
     
     # Test case 10: Invalid - empty parentheses
     test10 = "10 + ()"
-    validate_expression(test10)
\ No newline at end of file
+    validate_expression(test10)
+    
+    # Validasi batch tanpa print, hasil ringkas per ekspresi
+    print(validate_many([test1, test2, test6, test10], workers=2))
+    
+    # Recognizer tanpa token harus menerima bahasa yang sama
+    verify_recognizer()
+    
+    # Semua error dalam satu pass, sebagai data
+    for diagnostic in diagnose_expression("10 + * (2 $ 3) ) - ()"):
+        print(f"  {diagnostic}")
+    
+    if "--benchmark" in sys.argv:
+        benchmark_validate_many()
+        benchmark_recognizer()
+        benchmark_validation_cache()
+        benchmark_diagnose()
+        benchmark_error_channel()
@@ -1,4 +1,14 @@
+import asyncio
+import codecs
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # ==================== AST Node Classes ====================
 
@@ -25,6 +35,8 @@ class BinOpNode:
 # ==================== Token Classes ====================
 
 class Token:
+    __slots__ = ('type', 'value')
+    
     def __init__(self, type, value):
         self.type = type
         self.value = value
@@ -33,6 +45,14 @@ class Token:
         return f"Token({self.type}, {self.value})"
 
 
+class LexerError(Exception):
+    """Karakter yang tidak dikenali lexer"""
+
+
+class ParseError(Exception):
+    """Urutan token yang tidak sesuai grammar"""
+
+
 # ==================== Lexer ====================
 
 class Lexer:
@@ -98,11 +118,109 @@ class Lexer:
                 self.advance()
                 return Token('RPAREN', ')')
             
-            raise Exception(f"Invalid character: {self.current_char}")
+            raise LexerError(f"Invalid character: {self.current_char}")
         
         return Token('EOF', None)
 
 
+# Pola master: lewati spasi, lalu tangkap angka (grup 1), bagian desimal
+# (grup 2), atau operator (grup 3)
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+(\.\d*)?)|([-+*/()]))')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+OPERATOR_TYPES = {
+    '+': 'PLUS',
+    '-': 'MINUS',
+    '*': 'MUL',
+    '/': 'DIV',
+    '(': 'LPAREN',
+    ')': 'RPAREN',
+}
+
+# Token operator bersifat tetap, jadi cukup satu instance per operator
+OPERATOR_TOKENS = {char: Token(type, char) for char, type in OPERATOR_TYPES.items()}
+
+
+class FastLexer:
+    """Lexer berbasis regex: lexeme angka diambil dengan slicing, bukan
+    disusun karakter demi karakter"""
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+    
+    def error(self):
+        pos = WHITESPACE_PATTERN.match(self.text, self.pos).end()
+        self.pos = pos
+        if pos >= len(self.text):
+            return Token('EOF', None)
+        raise LexerError(f"Invalid character: {self.text[pos]}")
+    
+    def get_next_token(self):
+        match = TOKEN_PATTERN.match(self.text, self.pos)
+        if match is None:
+            return self.error()
+        
+        self.pos = match.end()
+        number, fraction, operator = match.groups()
+        if number is not None:
+            return Token('FLOAT' if fraction is not None else 'INTEGER', number)
+        return OPERATOR_TOKENS[operator]
+
+
+# ==================== Stream Lexer ====================
+
+# Ukuran chunk default untuk streaming (64 KB)
+CHUNK_SIZE = 1 << 16
+
+
+class StreamLexer:
+    """Lexer streaming dari file object (teks/biner) atau mmap: input dibaca
+    per chunk dan token dihasilkan secara lazy, sehingga Parser maupun
+    IterativeParser bisa membaca ekspresi besar dengan buffer konstan"""
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.tokens = self.scan(source, chunk_size)
+    
+    def scan(self, source, chunk_size):
+        """Generator token; lexeme yang terpotong di batas chunk disambung
+        dengan chunk berikutnya"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        eof = False
+        
+        while not eof:
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk, final=eof)
+            buffer += chunk
+            
+            pos = 0
+            end = len(buffer)
+            while True:
+                match = TOKEN_PATTERN.match(buffer, pos)
+                if match is None:
+                    pos = WHITESPACE_PATTERN.match(buffer, pos).end()
+                    if pos < end:
+                        raise LexerError(f"Invalid character: {buffer[pos]}")
+                    break
+                
+                # Angka di akhir buffer mungkin berlanjut di chunk berikutnya
+                if match.end() == end and not eof:
+                    break
+                
+                pos = match.end()
+                number, fraction, operator = match.groups()
+                if number is not None:
+                    yield Token('FLOAT' if fraction is not None else 'INTEGER', number)
+                else:
+                    yield OPERATOR_TOKENS[operator]
+            
+            buffer = buffer[pos:]
+    
+    def get_next_token(self):
+        return next(self.tokens, None) or Token('EOF', None)
+
+
 # ==================== Parser ====================
 
 class Parser:
@@ -111,7 +229,7 @@ class Parser:
         self.current_token = self.lexer.get_next_token()
     
     def error(self):
-        raise Exception("Invalid syntax")
+        raise ParseError("Invalid syntax")
     
     def eat(self, token_type):
         if self.current_token.type == token_type:
@@ -162,16 +280,380 @@ class Parser:
         return self.expr()
 
 
+# ==================== Iterative Parser ====================
+
+BINARY_PRECEDENCE = {'PLUS': 1, 'MINUS': 1, 'MUL': 2, 'DIV': 2}
+
+
+class IterativeParser(Parser):
+    """Parser tanpa rekursi: stack eksplisit untuk '(' dan operator biner,
+    sehingga kurung bersarang sangat dalam tidak memicu RecursionError"""
+    
+    def expr(self):
+        # Entri stack: None untuk '(' atau (op_token, operand_kiri)
+        stack = []
+        
+        while True:
+            token = self.current_token
+            if token.type == 'LPAREN':
+                self.eat('LPAREN')
+                stack.append(None)
+                continue
+            if token.type in ('INTEGER', 'FLOAT'):
+                self.eat(token.type)
+                node = NumberNode(token)
+            else:
+                self.error()
+            
+            while True:
+                token = self.current_token
+                precedence = BINARY_PRECEDENCE.get(token.type)
+                if precedence is not None:
+                    while (stack and stack[-1] is not None
+                           and BINARY_PRECEDENCE[stack[-1][0].type] >= precedence):
+                        op_token, left = stack.pop()
+                        node = BinOpNode(left, op_token, node)
+                    self.eat(token.type)
+                    stack.append((token, node))
+                    break
+                
+                while stack and stack[-1] is not None:
+                    op_token, left = stack.pop()
+                    node = BinOpNode(left, op_token, node)
+                
+                if not stack:
+                    return node
+                self.eat('RPAREN')
+                stack.pop()
+
+
+# ==================== Async Service ====================
+
+DEFAULT_PORT = 8765
+BATCH_SIZE = 64             # Maksimal ekspresi per batch ke worker
+BATCH_DELAY = 0.002         # Waktu tunggu (detik) untuk mengumpulkan batch
+STREAM_LIMIT = 1 << 24      # Batas panjang satu baris request (16 MB)
+CLOSE_TIMEOUT = 1.0         # Waktu tunggu koneksi selesai saat service ditutup
+
+
+def ast_to_postfix(node):
+    """Ubah AST menjadi list postfix datar (angka dan simbol operator) yang
+    bisa di-pickle dan di-serialize JSON berapapun dalamnya AST; dict
+    bersarang sedalam AST gagal di pickle/json untuk ekspresi panjang"""
+    postfix = []
+    stack = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+        if isinstance(current, BinOpNode):
+            if visited:
+                postfix.append(current.op_token.value)
+            else:
+                stack.append((current, True))
+                stack.append((current.right, False))
+                stack.append((current.left, False))
+        else:
+            postfix.append(current.value)
+    return postfix
+
+
+def parse_expression(text):
+    """Parse ekspresi lengkap; token sisa setelah ekspresi dianggap error"""
+    parser = IterativeParser(FastLexer(text))
+    ast = parser.parse()
+    if parser.current_token.type != 'EOF':
+        parser.error()
+    return ast
+
+
+def handle_batch(requests):
+    """Proses satu batch (mode, ekspresi) di dalam worker; hasil berupa
+    dict siap JSON sesuai urutan request"""
+    results = []
+    for mode, text in requests:
+        try:
+            if mode == 'parse':
+                results.append({'ok': True, 'postfix': ast_to_postfix(parse_expression(text))})
+            elif mode == 'validate':
+                parse_expression(text)
+                results.append({'ok': True})
+            else:
+                results.append({'ok': False, 'error': f"Unknown mode: {mode}"})
+        except Exception as e:
+            results.append({'ok': False, 'error': str(e)})
+    return results
+
+
+class ExpressionService:
+    """Front end asyncio: request yang datang bersamaan dikumpulkan menjadi
+    micro-batch lalu dikirim ke process pool yang menjalankan Lexer/Parser"""
+    
+    def __init__(self, workers=None, batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.executor = None
+        self.queue = None
+        self.batcher = None
+        self.tasks = set()
+        self.connections = set()
+    
+    async def __aenter__(self):
+        # Worker dibuat dengan spawn agar tidak mewarisi socket koneksi
+        # (dengan fork, socket yang ditutup client tetap terbuka di worker)
+        context = multiprocessing.get_context('spawn')
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.create_task(self.collect_batches())
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        if self.connections:
+            await asyncio.wait(self.connections, timeout=CLOSE_TIMEOUT)
+        self.batcher.cancel()
+        await asyncio.gather(self.batcher, *self.tasks, return_exceptions=True)
+        self.executor.shutdown()
+    
+    async def submit(self, mode, text):
+        """Masukkan satu request ke antrean dan tunggu hasilnya"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((mode, text, future))
+        return await future
+    
+    async def parse(self, text):
+        return await self.submit('parse', text)
+    
+    async def validate(self, text):
+        return await self.submit('validate', text)
+    
+    async def collect_batches(self):
+        """Ambil request dari antrean; tunggu sebentar agar request lain
+        ikut masuk batch, lalu kirim batch tanpa menunggu batch sebelumnya"""
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            if queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            task = asyncio.create_task(self.dispatch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+    
+    async def run_batch(self, requests):
+        """handle_batch di worker; error worker menjadi hasil error"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, handle_batch, requests)
+        except Exception as e:
+            return [{'ok': False, 'error': f"Worker error: {e}"}] * len(requests)
+    
+    async def dispatch(self, batch):
+        """Jalankan satu batch di worker dan selesaikan future-nya. Jika
+        batch gagal di worker (misalnya hasil tidak bisa di-pickle), setiap
+        request diulang sendiri agar satu request rusak tidak menggagalkan
+        request lain di batch yang sama"""
+        requests = [(mode, text) for mode, text, _ in batch]
+        results = await self.run_batch(requests)
+        if len(requests) > 1 and any(
+                not result['ok'] and result['error'].startswith("Worker error")
+                for result in results):
+            singles = await asyncio.gather(*(self.run_batch([request]) for request in requests))
+            results = [single[0] for single in singles]
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def handle_connection(service, reader, writer):
+    """Protokol JSON per baris: {"id", "mode", "expression"} dijawab
+    {"id", "ok", "postfix"/"error"}; jawaban bisa keluar tidak berurutan"""
+    tasks = set()
+    connection = asyncio.current_task()
+    service.connections.add(connection)
+    
+    async def respond(request):
+        try:
+            result = await service.submit(request.get('mode', 'parse'), request['expression'])
+        except Exception as e:
+            result = {'ok': False, 'error': f"Bad request: {e}"}
+        writer.write(json.dumps(dict(result, id=request.get('id'))).encode() + b'\n')
+    
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError(f"expected JSON object, got {type(request).__name__}")
+            except ValueError as e:
+                writer.write(json.dumps({'ok': False, 'error': f"Bad request: {e}"}).encode() + b'\n')
+                continue
+            task = asyncio.create_task(respond(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        await writer.drain()
+    except ConnectionError:
+        pass        # Client menutup koneksi sebelum semua jawaban terkirim
+    finally:
+        writer.close()
+        service.connections.discard(connection)
+
+
+async def serve(service, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+    """Jalankan server TCP, atau Unix socket jika path diberikan"""
+    def handler(reader, writer):
+        return handle_connection(service, reader, writer)
+    
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path, limit=STREAM_LIMIT)
+    return await asyncio.start_server(handler, host, port, limit=STREAM_LIMIT)
+
+
+class ExpressionClient:
+    """Client async untuk ExpressionService; banyak request boleh berjalan
+    bersamaan di satu koneksi (dicocokkan lewat id)"""
+    
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending = {}
+        self.receiver = asyncio.create_task(self.receive())
+    
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=STREAM_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        return cls(reader, writer)
+    
+    async def request(self, mode, text):
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        message = {'id': request_id, 'mode': mode, 'expression': text}
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+        return await future
+    
+    async def parse(self, text):
+        return await self.request('parse', text)
+    
+    async def validate(self, text):
+        return await self.request('validate', text)
+    
+    async def receive(self):
+        """Terima jawaban dan teruskan ke future yang menunggu"""
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.pending.pop(response.pop('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Koneksi ke server terputus"))
+            self.pending.clear()
+    
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.receiver
+
+
+def random_expression(rng, terms=8):
+    """Ekspresi acak untuk load test (sekitar 5% sengaja tidak valid)"""
+    text = " + ".join(f"({rng.randint(0, 999)} * {rng.randint(0, 99)}.5)" for _ in range(terms))
+    if rng.random() < 0.05:
+        text += " )"
+    return text
+
+
+async def load_test(requests=20000, concurrency=256, connections=4,
+                    batch_sizes=(1, BATCH_SIZE), workers=None):
+    """Ukur latensi p50/p99 dan throughput server di localhost"""
+    rng = random.Random(0)
+    expressions = [random_expression(rng) for _ in range(1000)]
+    print(f"Load test: {requests} request, {concurrency} concurrent, {connections} koneksi")
+    
+    for batch_size in batch_sizes:
+        async with ExpressionService(workers, batch_size=batch_size) as service:
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            clients = [await ExpressionClient.connect(port=port) for _ in range(connections)]
+            latencies = []
+            counter = iter(range(requests))
+            
+            async def user(client):
+                for i in counter:
+                    start = time.perf_counter()
+                    await client.parse(expressions[i % len(expressions)])
+                    latencies.append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            await asyncio.gather(*(user(clients[k % connections]) for k in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            
+            for client in clients:
+                await client.close()
+            server.close()
+            await server.wait_closed()
+        
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        print(f"  batch {batch_size:>3}: p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   "
+              f"{requests / elapsed:9.0f} request/detik")
+
+
+async def run_server(target=None):
+    """Server sampai dihentikan; target berupa port atau path Unix socket"""
+    async with ExpressionService() as service:
+        if target is not None and not target.isdigit():
+            server = await serve(service, path=target)
+        else:
+            server = await serve(service, port=int(target or DEFAULT_PORT))
+        names = [str(sock.getsockname()) for sock in server.sockets]
+        print(f"Listening on {', '.join(names)}")
+        async with server:
+            await server.serve_forever()
+
+
 # ==================== Main Function ====================
 
 def main():
-    if len(sys.argv) > 1:
-        text = sys.argv[1]
-    else:
-        text = input("Expression: ")
+    # --iterative memilih parser tanpa rekursi; --stream membaca ekspresi dari
+    # file (argumen pertama) per chunk; --serve [port|path] menjalankan
+    # server async, --load-test mengukur server di localhost
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    parser_class = IterativeParser if '--iterative' in sys.argv else Parser
     
-    lexer = Lexer(text)
-    parser = Parser(lexer)
+    if '--serve' in sys.argv:
+        asyncio.run(run_server(args[0] if args else None))
+        return
+    if '--load-test' in sys.argv:
+        asyncio.run(load_test())
+        return
+    
+    if '--stream' in sys.argv:
+        if not args:
+            print("Pemakaian: --stream <file> [--iterative]")
+            return
+        source = open(args[0], 'rb')
+        lexer = StreamLexer(source)
+    else:
+        source = None
+        text = args[0] if args else input("Expression: ")
+        lexer = FastLexer(text)
+    parser = parser_class(lexer)
     
     try:
         ast = parser.parse()
@@ -179,6 +661,9 @@ def main():
         print(ast)
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        if source is not None:
+            source.close()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,26 @@
+import codecs
+import decimal
+import importlib.util
+import mmap
+import operator
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque, namedtuple
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional, hanya untuk evaluate_columns()
+    np = None
+
 # ==================== TOKEN TYPES ====================
 TT_INT        = 'INT'
 TT_FLOAT      = 'FLOAT'
@@ -9,9 +32,12 @@ TT_LPAREN     = 'LPAREN'
 TT_RPAREN     = 'RPAREN'
 TT_IDENTIFIER = 'IDENTIFIER'
 TT_EQ         = 'EQ'          # Token untuk assignment '='
+TT_SEMI       = 'SEMI'        # Pemisah statement ';' atau newline (mode program)
 TT_EOF        = 'EOF'
 
 class Token:
+    __slots__ = ('type', 'value')
+    
     def __init__(self, type, value):
         self.type = type
         self.value = value
@@ -20,6 +46,33 @@ class Token:
         return f"Token({self.type}, '{self.value}')"
 
 
+class LexerError(Exception):
+    """Karakter yang tidak dikenali lexer"""
+
+
+class ParseError(Exception):
+    """Urutan token yang tidak sesuai grammar"""
+
+
+class UndefinedVariableError(KeyError):
+    """Variabel input yang tidak diberi nilai; subclass KeyError seperti
+    lookup env di evaluate(), tetapi pesannya tidak diberi tanda kutip"""
+    def __str__(self):
+        return str(self.args[0])
+
+
+class ASTFormatError(ValueError):
+    """File AST biner yang rusak: magic salah atau isi terpotong"""
+
+
+class FormulaError(ValueError):
+    """Formula yang tidak bisa dipasang di FormulaGraph"""
+
+
+class CycleError(FormulaError):
+    """Formula yang membuat dependensi siklik"""
+
+
 # ==================== LEXER ====================
 
 class Lexer:
@@ -120,15 +173,151 @@ class Lexer:
                 return Token(TT_EQ, '=')
             
             # Jika karakter tidak dikenali
-            raise Exception(f"Karakter tidak valid: '{self.current_char}'")
+            raise LexerError(f"Karakter tidak valid: '{self.current_char}'")
         
         # End of file
         return Token(TT_EOF, None)
 
 
+# ==================== FAST LEXER ====================
+
+# Pola master: lewati spasi, lalu tangkap angka (grup 1), bagian desimal
+# (grup 2), identifier (grup 3), atau operator (grup 4)
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+(\.\d*)?)|([^\W\d]\w*)|([-+*/()=]))')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+OPERATOR_TYPES = {
+    '+': TT_PLUS,
+    '-': TT_MINUS,
+    '*': TT_MUL,
+    '/': TT_DIV,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '=': TT_EQ,
+}
+
+# Token operator bersifat tetap, jadi cukup satu instance per operator
+OPERATOR_TOKENS = {char: Token(type, char) for char, type in OPERATOR_TYPES.items()}
+
+
+class FastLexer:
+    """Lexer berbasis regex: satu match per token, lexeme angka dan
+    identifier diambil langsung dengan slicing dari teks sumber"""
+    token_pattern = TOKEN_PATTERN
+    whitespace_pattern = WHITESPACE_PATTERN
+    operator_tokens = OPERATOR_TOKENS
+    
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+    
+    def error(self):
+        """Cari karakter tidak valid setelah spasi, atau kembalikan EOF"""
+        pos = self.whitespace_pattern.match(self.text, self.pos).end()
+        self.pos = pos
+        if pos >= len(self.text):
+            return Token(TT_EOF, None)
+        raise LexerError(f"Karakter tidak valid: '{self.text[pos]}'")
+    
+    def get_next_token(self):
+        """Tokenizer (Lexical Analyzer) dengan satu regex match per token"""
+        match = self.token_pattern.match(self.text, self.pos)
+        if match is None:
+            return self.error()
+        
+        self.pos = match.end()
+        number, fraction, name, operator = match.groups()
+        if number is not None:
+            if fraction is not None:
+                return Token(TT_FLOAT, float(number))
+            return Token(TT_INT, int(number))
+        if name is not None:
+            return Token(TT_IDENTIFIER, name)
+        return self.operator_tokens[operator]
+
+
+# Mode program: newline dan ';' menjadi pemisah statement, bukan spasi
+PROGRAM_TOKEN_PATTERN = re.compile(r'[^\S\n]*(?:(\d+(\.\d*)?)|([^\W\d]\w*)|([-+*/()=;\n]))')
+PROGRAM_WHITESPACE_PATTERN = re.compile(r'[^\S\n]*')
+PROGRAM_OPERATOR_TOKENS = dict(OPERATOR_TOKENS, **{';': Token(TT_SEMI, ';'),
+                                                   '\n': Token(TT_SEMI, '\\n')})
+
+
+class ProgramLexer(FastLexer):
+    """FastLexer untuk program multi-statement (pemisah ';' atau newline)"""
+    token_pattern = PROGRAM_TOKEN_PATTERN
+    whitespace_pattern = PROGRAM_WHITESPACE_PATTERN
+    operator_tokens = PROGRAM_OPERATOR_TOKENS
+
+
+# ==================== STREAM LEXER ====================
+
+# Ukuran chunk default untuk streaming (64 KB)
+CHUNK_SIZE = 1 << 16
+
+
+class StreamLexer:
+    """Lexer streaming dari file object (teks/biner) atau mmap: input dibaca
+    per chunk dan token dihasilkan secara lazy dengan memori konstan"""
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.tokens = self.scan(source, chunk_size)
+        self.pos = 0    # Offset global setelah token terakhir
+    
+    def scan(self, source, chunk_size):
+        """Generator (token, offset_akhir); lexeme yang terpotong di batas
+        chunk disambung dengan chunk berikutnya"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        offset = 0  # Offset global awal buffer
+        eof = False
+        
+        while not eof:
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk, final=eof)
+            buffer += chunk
+            
+            pos = 0
+            end = len(buffer)
+            while True:
+                match = TOKEN_PATTERN.match(buffer, pos)
+                if match is None:
+                    pos = WHITESPACE_PATTERN.match(buffer, pos).end()
+                    if pos < end:
+                        raise LexerError(f"Karakter tidak valid: '{buffer[pos]}'")
+                    break
+                
+                # Angka/identifier di akhir buffer mungkin berlanjut
+                if match.end() == end and not eof:
+                    break
+                
+                pos = match.end()
+                number, fraction, name, operator = match.groups()
+                if number is not None:
+                    if fraction is not None:
+                        token = Token(TT_FLOAT, float(number))
+                    else:
+                        token = Token(TT_INT, int(number))
+                elif name is not None:
+                    token = Token(TT_IDENTIFIER, name)
+                else:
+                    token = OPERATOR_TOKENS[operator]
+                yield token, offset + pos
+            
+            offset += pos
+            buffer = buffer[pos:]
+    
+    def get_next_token(self):
+        token, self.pos = next(self.tokens, (Token(TT_EOF, None), self.pos))
+        return token
+
+
 # ==================== AST NODE CLASSES ====================
 
 class NumberNode:
+    __slots__ = ('token', 'value')
+    
     def __init__(self, token):
         self.token = token
         self.value = token.value
@@ -138,6 +327,8 @@ class NumberNode:
 
 
 class BinOpNode:
+    __slots__ = ('left_node', 'op_token', 'right_node')
+    
     def __init__(self, left_node, op_token, right_node):
         self.left_node = left_node
         self.op_token = op_token
@@ -148,6 +339,8 @@ class BinOpNode:
 
 
 class VarAssignNode:
+    __slots__ = ('var_name_token', 'value_node')
+    
     def __init__(self, var_name_token, value_node):
         self.var_name_token = var_name_token
         self.value_node = value_node
@@ -157,6 +350,8 @@ class VarAssignNode:
 
 
 class VarAccessNode:
+    __slots__ = ('var_name_token',)
+    
     def __init__(self, var_name_token):
         self.var_name_token = var_name_token
     
@@ -164,20 +359,42 @@ class VarAccessNode:
         return f"VarAccessNode({self.var_name_token.value})"
 
 
+class ProgramNode:
+    __slots__ = ('statements',)
+    
+    def __init__(self, statements):
+        self.statements = statements
+    
+    def __repr__(self):
+        return f"ProgramNode({', '.join(map(repr, self.statements))})"
+
+
 # ==================== PARSER ====================
 
 class Parser:
     def __init__(self, lexer):
         self.lexer = lexer
+        self.lookahead = deque()    # Ring buffer token yang sudah di-lex
         self.current_token = self.lexer.get_next_token()
     
     def error(self, message="Syntax error"):
-        raise Exception(f"{message} pada token: {self.current_token}")
+        raise ParseError(f"{message} pada token: {self.current_token}")
+    
+    def peek(self, n=0):
+        """Lihat token ke-n setelah current_token tanpa mengonsumsinya;
+        token yang di-lex untuk lookahead disimpan agar tidak di-lex ulang"""
+        lookahead = self.lookahead
+        while len(lookahead) <= n:
+            lookahead.append(self.lexer.get_next_token())
+        return lookahead[n]
     
     def eat(self, token_type):
         """Mengonsumsi token jika sesuai, atau error"""
         if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+            if self.lookahead:
+                self.current_token = self.lookahead.popleft()
+            else:
+                self.current_token = self.lexer.get_next_token()
         else:
             self.error(f"Expected {token_type}, got {self.current_token.type}")
     
@@ -242,29 +459,29 @@ class Parser:
     
     def statement(self):
         """statement : IDENTIFIER EQ expr | expr"""
-        # Lookahead untuk membedakan assignment vs access
-        if self.current_token.type == TT_IDENTIFIER:
+        # Lookahead satu token untuk membedakan assignment vs access
+        if self.current_token.type == TT_IDENTIFIER and self.peek().type == TT_EQ:
             var_name_token = self.current_token
-            
-            # Cek token berikutnya tanpa mengonsumsinya
-            temp_pos = self.lexer.pos
-            temp_char = self.lexer.current_char
-            temp_token = self.lexer.get_next_token()  # Token sementara
-            
-            # Reset lexer ke posisi sebelumnya
-            self.lexer.pos = temp_pos
-            self.lexer.current_char = temp_char
-            
-            # Jika token berikutnya adalah '=', ini adalah assignment
-            if temp_token.type == TT_EQ:
-                self.eat(TT_IDENTIFIER)
-                self.eat(TT_EQ)
-                expr_node = self.expr()
-                return VarAssignNode(var_name_token, expr_node)
+            self.eat(TT_IDENTIFIER)
+            self.eat(TT_EQ)
+            expr_node = self.expr()
+            return VarAssignNode(var_name_token, expr_node)
         
         # Jika bukan assignment, parse sebagai ekspresi biasa
         return self.expr()
     
+    def program(self):
+        """program : statement (SEMI statement)*  (statement kosong dilewati)"""
+        statements = []
+        while self.current_token.type != TT_EOF:
+            if self.current_token.type == TT_SEMI:
+                self.eat(TT_SEMI)
+                continue
+            statements.append(self.statement())
+            if self.current_token.type != TT_EOF:
+                self.eat(TT_SEMI)
+        return ProgramNode(statements)
+    
     def parse(self):
         """Parse statement"""
         try:
@@ -278,94 +495,2657 @@ class Parser:
             return None
 
 
-# ==================== TESTING ====================
+def parse_text(text, parser_class=Parser, factory=None):
+    """Parse satu statement tanpa print; error dilempar sebagai LexerError
+    atau ParseError. Jika factory (HashConsFactory) diberikan, AST
+    dikembalikan dalam bentuk hash-consed"""
+    parser = parser_class(FastLexer(text))
+    ast = parser.statement()
+    if parser.current_token.type != TT_EOF:
+        parser.error("Unexpected tokens at the end")
+    if factory is not None:
+        return factory.intern(ast)
+    return ast
 
-def test_lexer(text):
-    """Test lexer untuk menampilkan token list"""
-    print(f"\nTokenizing: '{text}'")
-    lexer = Lexer(text)
-    tokens = []
+
+class CountingLexer(FastLexer):
+    """FastLexer yang menghitung jumlah token yang di-lex (untuk benchmark)"""
+    def __init__(self, text):
+        super().__init__(text)
+        self.count = 0
     
-    while True:
-        token = lexer.get_next_token()
-        if token.type == TT_EOF:
-            break
-        tokens.append(token)
+    def get_next_token(self):
+        self.count += 1
+        return super().get_next_token()
+
+
+class RescanParser(Parser):
+    """statement() versi lama: lookahead dengan me-lex token berikutnya lalu
+    memundurkan lexer. Hanya dipakai sebagai pembanding di benchmark"""
+    def statement(self):
+        if self.current_token.type == TT_IDENTIFIER:
+            var_name_token = self.current_token
+            temp_pos = self.lexer.pos
+            temp_token = self.lexer.get_next_token()
+            self.lexer.pos = temp_pos
+            if temp_token.type == TT_EQ:
+                self.eat(TT_IDENTIFIER)
+                self.eat(TT_EQ)
+                return VarAssignNode(var_name_token, self.expr())
+        return self.expr()
+
+
+def benchmark_lookahead(count=100000):
+    """Bandingkan lookahead rewind lama dengan buffer lookahead Parser.peek()
+    pada statement yang banyak identifier"""
+    texts = [f"total_{i} = price_{i} * qty + tax_{i % 10}" if i % 2 else
+             f"price_{i} * qty - discount_{i % 7}" for i in range(count)]
+    print(f"Benchmark lookahead: {count} statement")
     
-    for token in tokens:
-        print(f"  {token}")
+    for parser_class in (RescanParser, Parser):
+        lexed = 0
+        start = time.perf_counter()
+        for text in texts:
+            lexer = CountingLexer(text)
+            parser_class(lexer).parse()
+            lexed += lexer.count
+        elapsed = time.perf_counter() - start
+        print(f"  {parser_class.__name__:<13} {count / elapsed:10.0f} statement/detik  "
+              f"({lexed} token di-lex)")
 
-def test_parser(text):
-    """Test parser untuk menghasilkan AST"""
-    print(f"\nParsing: '{text}'")
+
+def parse_program(text, parser_class=Parser):
+    """Parse program multi-statement tanpa print; error dilempar"""
+    return parser_class(ProgramLexer(text)).program()
+
+
+# ==================== HASH-CONSED NODES ====================
+
+class ImmutableNode:
+    """Mixin node hash-consed: atribut tidak bisa diubah setelah dibuat.
+    Karena subtree identik selalu objek yang sama, perbandingan dan hash
+    bawaan object (berdasarkan identitas) sudah O(1) dan struktural"""
+    __slots__ = ()
     
-    try:
-        lexer = Lexer(text)
-        parser = Parser(lexer)
-        ast = parser.parse()
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} bersifat immutable")
+    
+    @classmethod
+    def build(cls, **fields):
+        node = object.__new__(cls)
+        for name, value in fields.items():
+            object.__setattr__(node, name, value)
+        return node
+
+
+class SharedNumberNode(ImmutableNode, NumberNode):
+    __slots__ = ()
+
+
+class SharedBinOpNode(ImmutableNode, BinOpNode):
+    __slots__ = ()
+
+
+class SharedVarAssignNode(ImmutableNode, VarAssignNode):
+    __slots__ = ()
+
+
+class SharedVarAccessNode(ImmutableNode, VarAccessNode):
+    __slots__ = ()
+
+
+class HashConsFactory:
+    """Factory node dengan hash-consing: setiap subtree yang identik secara
+    struktural hanya dibuat sekali dan dipakai bersama oleh semua AST"""
+    def __init__(self):
+        self.table = {}      # Kunci struktural -> node bersama
+        self.requests = 0    # Jumlah node yang diminta (sebelum sharing)
+    
+    def lookup(self, key, node_class, **fields):
+        self.requests += 1
+        node = self.table.get(key)
+        if node is None:
+            node = self.table[key] = node_class.build(**fields)
+        return node
+    
+    def token(self, type, value):
+        """Token bersama; kunci memakai tipe dan repr nilai (bukan ==) agar
+        1 dan 1.0 maupun 0.0 dan -0.0 berbeda dan nan tetap bisa dibagi"""
+        if value in OPERATOR_TOKENS and OPERATOR_TOKENS[value].type == type:
+            return OPERATOR_TOKENS[value]
+        key = (Token, type, value.__class__, repr(value))
+        token = self.table.get(key)
+        if token is None:
+            token = self.table[key] = Token(type, value)
+        return token
+    
+    def number(self, token):
+        token = self.token(token.type, token.value)
+        return self.lookup((NumberNode, token), SharedNumberNode,
+                           token=token, value=token.value)
+    
+    def binop(self, left_node, op_token, right_node):
+        # Anak sudah di-intern, jadi identitasnya cukup sebagai kunci
+        op_token = self.token(op_token.type, op_token.value)
+        return self.lookup((BinOpNode, left_node, op_token, right_node), SharedBinOpNode,
+                           left_node=left_node, op_token=op_token, right_node=right_node)
+    
+    def var_access(self, var_name_token):
+        token = self.token(TT_IDENTIFIER, var_name_token.value)
+        return self.lookup((VarAccessNode, token), SharedVarAccessNode,
+                           var_name_token=token)
+    
+    def var_assign(self, var_name_token, value_node):
+        token = self.token(TT_IDENTIFIER, var_name_token.value)
+        return self.lookup((VarAssignNode, token, value_node), SharedVarAssignNode,
+                           var_name_token=token, value_node=value_node)
+    
+    def intern(self, node):
+        """Salin AST biasa menjadi AST hash-consed (postorder tanpa rekursi)"""
+        results = []
+        stack = [(node, False)]
+        while stack:
+            current, visited = stack.pop()
+            if isinstance(current, NumberNode):
+                results.append(self.number(current.token))
+            elif isinstance(current, VarAccessNode):
+                results.append(self.var_access(current.var_name_token))
+            elif not visited:
+                stack.append((current, True))
+                if isinstance(current, VarAssignNode):
+                    stack.append((current.value_node, False))
+                else:
+                    stack.append((current.right_node, False))
+                    stack.append((current.left_node, False))
+            elif isinstance(current, VarAssignNode):
+                results.append(self.var_assign(current.var_name_token, results.pop()))
+            else:
+                right = results.pop()
+                left = results.pop()
+                results.append(self.binop(left, current.op_token, right))
+        return results.pop()
+    
+    def stats(self):
+        """Jumlah node yang diminta versus objek unik yang disimpan"""
+        return {'requests': self.requests, 'unique': len(self.table)}
+
+
+# ==================== ITERATIVE PARSER ====================
+
+# Jenis entri di stack operator IterativeParser
+STACK_LPAREN, STACK_UNARY, STACK_BINARY = range(3)
+
+BINARY_PRECEDENCE = {TT_PLUS: 1, TT_MINUS: 1, TT_MUL: 2, TT_DIV: 2}
+
+
+class IterativeParser(Parser):
+    """Parser dengan expr() iteratif (precedence climbing dengan stack
+    eksplisit): kedalaman stack Python tetap O(1) berapapun dalamnya kurung
+    atau tanda unary, dan pohon AST yang dihasilkan sama dengan Parser"""
+    
+    def expr(self):
+        """expr tanpa rekursi; stack berisi (jenis, token, operand_kiri)"""
+        stack = []
         
-        if ast:
-            print(f"AST: {ast}")
-            return True
+        while True:
+            # Posisi operand: tanda unary dan '(' ditumpuk sampai ketemu atom
+            token = self.current_token
+            if token.type in (TT_PLUS, TT_MINUS):
+                self.eat(token.type)
+                stack.append((STACK_UNARY, token, None))
+                continue
+            if token.type == TT_LPAREN:
+                self.eat(TT_LPAREN)
+                stack.append((STACK_LPAREN, token, None))
+                continue
+            if token.type == TT_INT or token.type == TT_FLOAT:
+                self.eat(token.type)
+                node = NumberNode(token)
+            elif token.type == TT_IDENTIFIER:
+                self.eat(TT_IDENTIFIER)
+                node = VarAccessNode(token)
+            else:
+                self.error("Expected INT, FLOAT, IDENTIFIER, or LPAREN")
+            
+            # Posisi operator: node adalah operand yang sudah lengkap
+            while True:
+                # Unary berlaku pada factor, jadi langsung diterapkan
+                while stack and stack[-1][0] == STACK_UNARY:
+                    zero_node = NumberNode(Token(TT_INT, 0))
+                    node = BinOpNode(zero_node, stack.pop()[1], node)
+                
+                token = self.current_token
+                precedence = BINARY_PRECEDENCE.get(token.type)
+                if precedence is not None:
+                    # Asosiatif kiri: reduksi operator dengan presedensi >=
+                    while (stack and stack[-1][0] == STACK_BINARY
+                           and BINARY_PRECEDENCE[stack[-1][1].type] >= precedence):
+                        _, op_token, left = stack.pop()
+                        node = BinOpNode(left, op_token, node)
+                    self.eat(token.type)
+                    stack.append((STACK_BINARY, token, node))
+                    break
+                
+                # Bukan operator biner: reduksi sampai '(' terdekat
+                while stack and stack[-1][0] == STACK_BINARY:
+                    _, op_token, left = stack.pop()
+                    node = BinOpNode(left, op_token, node)
+                
+                if not stack:
+                    return node
+                # Tersisa '(' yang harus ditutup
+                self.eat(TT_RPAREN)
+                stack.pop()
+
+
+# ==================== EVALUATOR & COMPILER ====================
+
+OPERATOR_SYMBOLS = {TT_PLUS: '+', TT_MINUS: '-', TT_MUL: '*', TT_DIV: '/'}
+
+SCALAR_OPERATORS = {
+    TT_PLUS: operator.add,
+    TT_MINUS: operator.sub,
+    TT_MUL: operator.mul,
+    TT_DIV: operator.truediv,
+}
+
+
+def evaluate(node, env):
+    """Evaluasi AST secara rekursif (tree walking) terhadap binding env"""
+    if isinstance(node, NumberNode):
+        return node.value
+    if isinstance(node, VarAccessNode):
+        return env[node.var_name_token.value]
+    if isinstance(node, VarAssignNode):
+        return evaluate(node.value_node, env)
+    
+    left = evaluate(node.left_node, env)
+    right = evaluate(node.right_node, env)
+    op = node.op_token.type
+    if op == TT_PLUS:
+        return left + right
+    if op == TT_MINUS:
+        return left - right
+    if op == TT_MUL:
+        return left * right
+    return left / right
+
+
+def constant_namer(namespace, convert=None):
+    """constant_name untuk emit_expression: literal disimpan di namespace
+    exec dengan nama c0, c1, ... alih-alih di-inline lewat repr() (repr
+    inf/nan bukan ekspresi Python yang valid). convert(nilai), jika ada,
+    diterapkan sekali saat compile"""
+    names = {}      # (tipe, repr) -> nama global
+    
+    def constant_name(value):
+        key = (value.__class__, repr(value))
+        if key not in names:
+            names[key] = f"c{len(names)}"
+            namespace[names[key]] = value if convert is None else convert(value)
+        return names[key]
+    return constant_name
+
+
+def emit_expression(node, local_name, lines, constant_name, operator_names=None):
+    """Tulis kode three-address untuk node ke lines (postorder tanpa
+    rekursi); kembalikan ekspresi Python yang memegang hasilnya.
+    local_name(nama) memetakan variabel ke nama lokal Python,
+    constant_name(nilai) memetakan literal ke nama Python (constant_namer), dan
+    operator_names (tipe token -> nama fungsi) mengganti operator infix
+    dengan panggilan fungsi"""
+    results = []
+    stack = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+        if isinstance(current, BinOpNode):
+            if visited:
+                right = results.pop()
+                left = results.pop()
+                temp = f"t{len(lines)}"
+                if operator_names is not None:
+                    function = operator_names[current.op_token.type]
+                    lines.append(f"    {temp} = {function}({left}, {right})")
+                else:
+                    symbol = OPERATOR_SYMBOLS[current.op_token.type]
+                    lines.append(f"    {temp} = {left} {symbol} {right}")
+                results.append(temp)
+            else:
+                stack.append((current, True))
+                stack.append((current.right_node, False))
+                stack.append((current.left_node, False))
+        elif isinstance(current, NumberNode):
+            results.append(constant_name(current.value))
         else:
-            print("❌ Failed to parse")
-            return False
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+            results.append(local_name(current.var_name_token.value))
+    return results.pop()
 
 
-if __name__ == "__main__":
-    print("=" * 60)
-    print("LEXER & PARSER DENGAN VARIABLE ASSIGNMENT")
-    print("=" * 60)
+class CompiledFormula:
+    """Formula hasil compile: fungsi Python biasa yang menerima mapping
+    nama variabel -> nilai, tanpa tree walking saat dievaluasi"""
+    __slots__ = ('function', 'target', 'variables', 'source')
     
-    # Test Lexer
-    print("\n" + "="*30 + " LEXER TESTS " + "="*30)
-    test_lexer("a = 100")
-    test_lexer("x = 10 + y * 2")
-    test_lexer("_var123 = (a + b) * c")
-    test_lexer("3.14 + 2.5")
+    def __init__(self, function, target, variables, source):
+        self.function = function
+        self.target = target          # Nama variabel untuk VarAssignNode
+        self.variables = variables    # Nama variabel yang dibaca
+        self.source = source
     
-    # Test Parser
-    print("\n" + "="*30 + " PARSER TESTS " + "="*30)
+    def __call__(self, env):
+        return self.function(env)
     
-    # Test 1: Simple assignment
-    print("\n1. Simple Assignment:")
-    test_parser("a = 100")
+    def __repr__(self):
+        return f"CompiledFormula({self.target}, {self.variables})"
+
+
+def compile_formula(node, backend=None):
+    """Compile AST menjadi fungsi Python lewat kode sumber three-address
+    (satu temporary per BinOpNode), sehingga tidak ada batas nesting
+    kurung dari compiler Python dan traversal dilakukan tanpa rekursi.
+    Dengan backend (NumericBackend), literal dikonversi sekali saat compile
+    dan operator diganti fungsi backend yang sudah terikat"""
+    target = None
+    if isinstance(node, VarAssignNode):
+        target = node.var_name_token.value
+        node = node.value_node
     
-    # Test 2: Assignment dengan ekspresi
-    print("\n2. Assignment dengan Ekspresi:")
-    test_parser("x = 10 + 20")
+    slots = {}      # Nama variabel -> nama lokal (v0, v1, ...)
+    namespace = {}
     
-    # Test 3: Access variable dalam ekspresi
-    print("\n3. Access Variable:")
-    test_parser("a + 5")
+    def local_name(name):
+        if name not in slots:
+            slots[name] = f"v{len(slots)}"
+        return slots[name]
     
-    # Test 4: Assignment dengan variable lain
-    print("\n4. Assignment dengan Variable:")
-    test_parser("y = x * 2")
+    constant_name = constant_namer(namespace)
+    operator_names = None
+    load = "env[{!r}]"
+    if backend is not None and backend.convert is not None:
+        constant_name = constant_namer(namespace, backend.convert)
+        namespace['convert'] = backend.convert
+        load = "convert(env[{!r}])"
+    if backend is not None and backend.operators is not None:
+        operator_names = {}
+        for type, function in backend.operators.items():
+            operator_names[type] = BACKEND_FUNCTION_NAMES[type]
+            namespace[BACKEND_FUNCTION_NAMES[type]] = function
     
-    # Test 5: Complex expression
-    print("\n5. Complex Expression:")
-    test_parser("result = (a + b) * (c - d) / 2")
+    lines = []
+    result = emit_expression(node, local_name, lines, constant_name, operator_names)
     
-    # Test 6: Multiple operations
-    print("\n6. Multiple Operations:")
-    test_parser("total = price * quantity + tax")
+    header = ["def formula(env):"]
+    header += [f"    {local} = {load.format(name)}" for name, local in slots.items()]
+    source = "\n".join(header + lines + [f"    return {result}"])
     
-    # Test 7: Float numbers
-    print("\n7. Float Numbers:")
-    test_parser("pi = 3.14")
-    test_parser("radius = 5.0")
-    test_parser("area = pi * radius * radius")
+    exec(compile(source, "<formula>", "exec"), namespace)
+    return CompiledFormula(namespace['formula'], target, tuple(slots), source)
+
+
+def evaluate_program(program, env):
+    """Evaluasi ProgramNode secara tree walking dengan environment dict;
+    kembalikan nilai statement terakhir"""
+    result = None
+    for statement in program.statements:
+        result = evaluate(statement, env)
+        if isinstance(statement, VarAssignNode):
+            env[statement.var_name_token.value] = result
+    return result
+
+
+class CompiledProgram:
+    """Program hasil compile. Setiap variabel punya slot integer tetap;
+    environment saat run berupa list slot (dan di dalam fungsi hasil compile
+    menjadi variabel lokal Python), bukan dict yang di-lookup per akses"""
+    __slots__ = ('function', 'names', 'slot_of', 'inputs', 'source')
     
-    # Test 8: Variable names dengan underscore
-    print("\n8. Variable dengan Underscore:")
-    test_parser("_temp = _value1 + _value2")
+    def __init__(self, function, names, inputs, source):
+        self.function = function
+        self.names = names                  # Nama variabel per slot
+        self.slot_of = {name: slot for slot, name in enumerate(names)}
+        self.inputs = inputs                # Variabel yang dibaca sebelum di-assign
+        self.source = source
     
-    # Test 9: Error cases
-    print("\n9. Error Cases:")
-    test_parser("= 100")  # Missing identifier
-    test_parser("a = ")   # Missing value
-    test_parser("123 = x") # Number sebagai identifier
\ No newline at end of file
+    def new_slots(self, values=None):
+        """Buat list slot baru, diisi dari mapping nama -> nilai"""
+        slots = [None] * len(self.names)
+        if values:
+            for name, value in values.items():
+                slot = self.slot_of.get(name)
+                if slot is not None:
+                    slots[slot] = value
+        return slots
+    
+    def run_slots(self, slots):
+        """Jalankan langsung di atas list slot (diubah di tempat)"""
+        return self.function(slots)
+    
+    def run(self, values=None):
+        """Jalankan dengan input mapping; kembalikan (nilai statement
+        terakhir, dict semua variabel)"""
+        missing = [name for name in self.inputs if not values or name not in values]
+        if missing:
+            raise UndefinedVariableError(f"Variabel tidak terdefinisi: {', '.join(missing)}")
+        slots = self.new_slots(values)
+        result = self.function(slots)
+        return result, dict(zip(self.names, slots))
+    
+    def __repr__(self):
+        return f"CompiledProgram({len(self.names)} slot, input={self.inputs})"
+
+
+def compile_program(program):
+    """Compile ProgramNode menjadi CompiledProgram: nama variabel di-resolve
+    ke slot integer saat compile sehingga tidak ada lookup nama saat run"""
+    slot_names = {}     # Nama variabel -> nama lokal (v0, v1, ...)
+    assigned = set()
+    inputs = []
+    
+    def local_name(name):
+        if name not in slot_names:
+            slot_names[name] = f"v{len(slot_names)}"
+        return slot_names[name]
+    
+    def read_name(name):
+        if name not in assigned and name not in inputs:
+            inputs.append(name)
+        return local_name(name)
+    
+    namespace = {}
+    constant_name = constant_namer(namespace)
+    lines = []
+    result = 'None'
+    for statement in program.statements:
+        if isinstance(statement, VarAssignNode):
+            value = emit_expression(statement.value_node, read_name, lines, constant_name)
+            name = statement.var_name_token.value
+            result = local_name(name)
+            lines.append(f"    {result} = {value}")
+            assigned.add(name)
+        else:
+            result = emit_expression(statement, read_name, lines, constant_name)
+    
+    locals_ = ", ".join(slot_names.values())
+    body = ["def program(slots):"]
+    if slot_names:
+        body.append(f"    {locals_}, = slots")
+    body += lines
+    if slot_names:
+        body.append(f"    slots[:] = ({locals_},)")
+    body.append(f"    return {result}")
+    source = "\n".join(body)
+    
+    exec(compile(source, "<program>", "exec"), namespace)
+    return CompiledProgram(namespace['program'], tuple(slot_names), tuple(inputs), source)
+
+
+def benchmark_program(statements=2000, runs=200):
+    """Bandingkan evaluate_program() (dict) dengan CompiledProgram (slot)"""
+    lines = ["x0 = a * 2 + b"]
+    for i in range(1, statements):
+        lines.append(f"x{i} = x{i - 1} * 0.5 + a - x{i // 2} / 3")
+    program = parse_program("\n".join(lines))
+    compiled = compile_program(program)
+    print(f"Benchmark program: {statements} statement, {runs} run")
+    
+    start = time.perf_counter()
+    for run in range(runs):
+        evaluate_program(program, {'a': run, 'b': 1.5})
+    tree_walk = time.perf_counter() - start
+    print(f"  {'evaluate_program':<18} {runs / tree_walk:10.1f} run/detik")
+    
+    start = time.perf_counter()
+    for run in range(runs):
+        compiled.run({'a': run, 'b': 1.5})
+    slotted = time.perf_counter() - start
+    print(f"  {'CompiledProgram':<18} {runs / slotted:10.1f} run/detik")
+    print(f"  Speedup: {tree_walk / slotted:.1f}x")
+
+
+def benchmark_compile(rows=200000):
+    """Bandingkan evaluate() rekursif dengan CompiledFormula pada banyak binding"""
+    text = "result = (a + b) * (c - d) / 2 + -a * 3.5 - (b / (c + 1))"
+    ast = Parser(FastLexer(text)).parse()
+    formula = compile_formula(ast)
+    bindings = [{'a': i, 'b': i * 0.5, 'c': i % 7, 'd': 3} for i in range(rows)]
+    print(f"Benchmark compile: '{text}', {rows} binding")
+    
+    results = {}
+    for name, run in (("evaluate", lambda env: evaluate(ast, env)),
+                      ("compiled", formula.function)):
+        start = time.perf_counter()
+        for env in bindings:
+            run(env)
+        results[name] = time.perf_counter() - start
+        print(f"  {name:<10} {rows / results[name]:12.0f} evaluasi/detik")
+    
+    print(f"  Speedup: {results['evaluate'] / results['compiled']:.1f}x")
+    return results
+
+
+# ==================== NUMERIC BACKENDS ====================
+
+# Backend angka untuk compile_formula():
+#   literal   - lexeme angka (str) -> nilai, dipakai NumericLexer
+#   convert   - nilai input/konstanta -> tipe backend (None: tanpa konversi)
+#   operators - tipe token -> fungsi biner (None: operator infix Python)
+NumericBackend = namedtuple('NumericBackend', ('name', 'literal', 'convert', 'operators'))
+
+# Nama fungsi operator backend di kode hasil compile
+BACKEND_FUNCTION_NAMES = {TT_PLUS: 'add', TT_MINUS: 'sub', TT_MUL: 'mul', TT_DIV: 'div'}
+
+
+def float_literal(lexeme):
+    return float(lexeme) if '.' in lexeme else int(lexeme)
+
+
+# Jalur cepat: sama persis dengan compile_formula() tanpa backend
+FLOAT_BACKEND = NumericBackend('float', float_literal, None, None)
+
+
+def decimal_backend(context=None):
+    """Backend decimal.Decimal dengan context tetap (default: presisi 28,
+    pembagian dengan nol dilempar). Operasi memakai method context yang
+    diikat saat compile, bukan context thread saat evaluasi"""
+    context = context or decimal.Context(traps=[decimal.DivisionByZero,
+                                                decimal.InvalidOperation,
+                                                decimal.Overflow])
+    create = context.create_decimal
+    
+    def convert(value):
+        # Float input diambil dari repr-nya (0.1 -> Decimal('0.1'))
+        return create(repr(value) if isinstance(value, float) else value)
+    
+    operators = {TT_PLUS: context.add, TT_MINUS: context.subtract,
+                 TT_MUL: context.multiply, TT_DIV: context.divide}
+    return NumericBackend('decimal', create, convert, operators)
+
+
+def fraction_convert(value):
+    """Nilai -> Fraction; float diambil dari repr-nya (0.1 -> 1/10)"""
+    return Fraction(repr(value) if isinstance(value, float) else value)
+
+
+# Pecahan eksak; operator infix Python langsung ke Fraction
+FRACTION_BACKEND = NumericBackend('fraction', Fraction, fraction_convert, None)
+
+
+class NumericLexer(FastLexer):
+    """FastLexer yang mengubah lexeme angka langsung dengan backend.literal,
+    tanpa lewat float, sehingga literal seperti 0.1 tetap eksak"""
+    def __init__(self, text, backend=FLOAT_BACKEND):
+        super().__init__(text)
+        self.literal = backend.literal
+    
+    def get_next_token(self):
+        match = self.token_pattern.match(self.text, self.pos)
+        if match is None:
+            return self.error()
+        
+        self.pos = match.end()
+        number, fraction, name, operator = match.groups()
+        if number is not None:
+            return Token(TT_FLOAT if fraction is not None else TT_INT, self.literal(number))
+        if name is not None:
+            return Token(TT_IDENTIFIER, name)
+        return self.operator_tokens[operator]
+
+
+def compile_numeric(text, backend=FLOAT_BACKEND):
+    """Parse dan compile satu statement dengan backend angka"""
+    parser = Parser(NumericLexer(text, backend))
+    ast = parser.statement()
+    if parser.current_token.type != TT_EOF:
+        parser.error("Unexpected tokens at the end")
+    return compile_formula(ast, backend)
+
+
+def benchmark_numeric(rows=100000):
+    """Throughput CompiledFormula untuk setiap backend angka"""
+    text = "result = (a + b) * (c - d) / 2 + -a * 3.5 - (b / (c + 1))"
+    bindings = [{'a': i, 'b': i * 0.5, 'c': i % 7, 'd': 3} for i in range(rows)]
+    print(f"Benchmark backend angka: '{text}', {rows} binding")
+    
+    results = {}
+    for backend in (FLOAT_BACKEND, decimal_backend(), FRACTION_BACKEND):
+        formula = compile_numeric(text, backend)
+        start = time.perf_counter()
+        for env in bindings:
+            formula(env)
+        results[backend.name] = time.perf_counter() - start
+        print(f"  {backend.name:<10} {rows / results[backend.name]:12.0f} evaluasi/detik  "
+              f"({results[backend.name] / results['float']:.1f}x waktu float)")
+    return results
+
+
+# ==================== VECTORIZED EVALUATOR ====================
+
+if np is not None:
+    OPERATOR_UFUNCS = {
+        TT_PLUS: np.add,
+        TT_MINUS: np.subtract,
+        TT_MUL: np.multiply,
+        TT_DIV: np.true_divide,
+    }
+
+
+def evaluate_columns(node, columns):
+    """Evaluasi AST terhadap mapping nama variabel -> array NumPy, satu
+    pass ufunc per BinOpNode. Buffer temporary dipakai ulang (out=) sehingga
+    jumlah array sementara sebanding kedalaman pohon, bukan jumlah node.
+    Promosi int/float dan pembagian (selalu float, error jika pembagi 0)
+    mengikuti evaluate()"""
+    if np is None:
+        raise ImportError("evaluate_columns() membutuhkan NumPy")
+    if isinstance(node, VarAssignNode):
+        node = node.value_node
+    
+    free_buffers = {}   # dtype -> list buffer milik evaluator yang bebas
+    results = []        # (nilai, milik_evaluator)
+    stack = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+        if isinstance(current, NumberNode):
+            results.append((current.value, False))
+        elif isinstance(current, VarAccessNode):
+            results.append((np.asarray(columns[current.var_name_token.value]), False))
+        elif not visited:
+            stack.append((current, True))
+            stack.append((current.right_node, False))
+            stack.append((current.left_node, False))
+        else:
+            right, right_owned = results.pop()
+            left, left_owned = results.pop()
+            op = current.op_token.type
+            
+            if op == TT_DIV and np.any(np.asarray(right) == 0):
+                raise ZeroDivisionError("division by zero")
+            if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+                # Sub-ekspresi konstan dihitung dengan aritmatika Python biasa
+                results.append((SCALAR_OPERATORS[op](left, right), False))
+                continue
+            
+            if op == TT_DIV:
+                dtype = np.dtype(np.float64)
+            else:
+                dtype = np.result_type(left, right)
+            shape = np.broadcast_shapes(np.shape(left), np.shape(right))
+            
+            # Pilih buffer output: operand milik sendiri, lalu buffer bebas
+            out = None
+            for value, owned in ((left, left_owned), (right, right_owned)):
+                if owned:
+                    if out is None and value.dtype == dtype and value.shape == shape:
+                        out = value
+                    else:
+                        free_buffers.setdefault(value.dtype, []).append(value)
+            if out is None:
+                candidates = free_buffers.get(dtype)
+                if candidates and candidates[-1].shape == shape:
+                    out = candidates.pop()
+                else:
+                    out = np.empty(shape, dtype=dtype)
+            
+            OPERATOR_UFUNCS[op](left, right, out=out)
+            results.append((out, True))
+    
+    value, _ = results.pop()
+    if not isinstance(value, np.ndarray) and columns:
+        length = len(next(iter(columns.values())))
+        return np.full(length, value)
+    return value
+
+
+def benchmark_columns(rows=10_000_000, row_sample=500_000):
+    """Bandingkan evaluate_columns() dengan evaluasi per baris (compiled)"""
+    if np is None:
+        print("Benchmark kolom dilewati: NumPy tidak terpasang")
+        return None
+    
+    text = "total = price * quantity + tax - price * 0.1 / (quantity + 1)"
+    ast = Parser(FastLexer(text)).parse()
+    rng = np.random.default_rng(0)
+    columns = {
+        'price': rng.random(rows) * 100,
+        'quantity': rng.integers(1, 50, rows),
+        'tax': rng.random(rows),
+    }
+    print(f"Benchmark kolom: '{text}', {rows} baris")
+    
+    start = time.perf_counter()
+    evaluate_columns(ast, columns)
+    vectorized = time.perf_counter() - start
+    print(f"  {'evaluate_columns':<18} {rows / vectorized:14.0f} baris/detik")
+    
+    # Per baris diukur pada sampel karena 10M baris terlalu lama di Python
+    formula = compile_formula(ast)
+    sample = [dict(zip(columns, values))
+              for values in zip(*(column[:row_sample].tolist() for column in columns.values()))]
+    start = time.perf_counter()
+    for env in sample:
+        formula(env)
+    per_row = time.perf_counter() - start
+    print(f"  {'per baris':<18} {row_sample / per_row:14.0f} baris/detik")
+    print(f"  Speedup: {(rows / vectorized) / (row_sample / per_row):.1f}x")
+
+
+# ==================== CONSTANT FOLDING ====================
+
+def count_nodes(node):
+    """Jumlah node dalam pohon AST (dihitung tanpa rekursi)"""
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        if isinstance(current, BinOpNode):
+            stack.append(current.left_node)
+            stack.append(current.right_node)
+        elif isinstance(current, VarAssignNode):
+            stack.append(current.value_node)
+    return count
+
+
+def number_node(value):
+    return NumberNode(Token(TT_FLOAT if isinstance(value, float) else TT_INT, value))
+
+
+def is_literal(node, value, value_type):
+    """True jika node adalah NumberNode dengan nilai dan tipe tertentu"""
+    return (isinstance(node, NumberNode) and type(node.value) is value_type
+            and node.value == value)
+
+
+def simplify_binop(node, left, left_type, right, right_type):
+    """Sederhanakan satu BinOpNode yang anaknya sudah disederhanakan.
+    Kembalikan (node, tipe_statis) dengan tipe int, float, atau None"""
+    op = node.op_token.type
+    if op == TT_DIV or float in (left_type, right_type):
+        result_type = float
+    elif left_type is int and right_type is int:
+        result_type = int
+    else:
+        result_type = None
+    
+    # Subtree konstan dihitung sekarang; pembagian dengan nol dan overflow
+    # (int raksasa ke float) dibiarkan agar tetap melempar saat evaluasi
+    if isinstance(left, NumberNode) and isinstance(right, NumberNode):
+        try:
+            return number_node(SCALAR_OPERATORS[op](left.value, right.value)), result_type
+        except (ZeroDivisionError, OverflowError):
+            pass
+    
+    # Identitas yang menghasilkan nilai dan tipe yang persis sama
+    # (termasuk tanda -0.0); x + 0 hanya aman untuk int
+    if op == TT_MUL:
+        if is_literal(right, 1, int) or (is_literal(right, 1.0, float) and left_type is float):
+            return left, left_type
+        if is_literal(left, 1, int) or (is_literal(left, 1.0, float) and right_type is float):
+            return right, right_type
+        if (is_literal(right, 0, int) and left_type is int) or \
+                (is_literal(left, 0, int) and right_type is int):
+            return number_node(0), int
+    elif op == TT_PLUS:
+        if is_literal(right, 0, int) and left_type is int:
+            return left, int
+        if is_literal(left, 0, int) and right_type is int:
+            return right, int
+    elif op == TT_MINUS:
+        if is_literal(right, 0, int) or (is_literal(right, 0.0, float) and left_type is float):
+            return left, left_type
+        # Unary minus ganda: 0 - (0 - x) -> x
+        if (is_literal(left, 0, int) and right_type is int and isinstance(right, BinOpNode)
+                and right.op_token.type == TT_MINUS and is_literal(right.left_node, 0, int)):
+            return right.right_node, int
+    elif op == TT_DIV:
+        if is_literal(right, 1.0, float) and left_type is float:
+            return left, float
+    
+    if left is node.left_node and right is node.right_node:
+        return node, result_type
+    return BinOpNode(left, node.op_token, right), result_type
+
+
+def fold_constants(node, int_variables=False):
+    """Optimasi AST: fold subtree konstan, hilangkan pembungkus unary 0, dan
+    terapkan identitas aman (x*1, x-0, x+0 dan x*0 untuk int). Tipe variabel
+    tidak diketahui kecuali int_variables=True (dengan asumsi itu x*0 tidak
+    lagi membaca x). Kembalikan (AST baru, jumlah node yang dihapus)"""
+    results = []    # (node, tipe_statis)
+    stack = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+        if isinstance(current, NumberNode):
+            results.append((current, type(current.value)))
+        elif isinstance(current, VarAccessNode):
+            results.append((current, int if int_variables else None))
+        elif not visited:
+            stack.append((current, True))
+            if isinstance(current, VarAssignNode):
+                stack.append((current.value_node, False))
+            else:
+                stack.append((current.right_node, False))
+                stack.append((current.left_node, False))
+        elif isinstance(current, VarAssignNode):
+            value_node, value_type = results.pop()
+            if value_node is not current.value_node:
+                current = VarAssignNode(current.var_name_token, value_node)
+            results.append((current, value_type))
+        else:
+            right, right_type = results.pop()
+            left, left_type = results.pop()
+            results.append(simplify_binop(current, left, left_type, right, right_type))
+    
+    folded, _ = results.pop()
+    return folded, count_nodes(node) - count_nodes(folded)
+
+
+def verify_constant_folding(count=20000, seed=0):
+    """Uji diferensial: evaluasi AST sebelum dan sesudah fold_constants()
+    harus memberi nilai dan tipe yang sama (termasuk -0.0 dan error
+    pembagian dengan nol)"""
+    rng = random.Random(seed)
+    pieces = ['a', 'b', '0', '1', '2', '0.0', '1.0', '2.5', '+', '-', '*', '/', '(', ')']
+    float_values = [0, 1, -1, 3, 0.0, -0.0, 1.0, 2.5]
+    
+    def outcome(ast, env):
+        try:
+            value = evaluate(ast, env)
+            return type(value).__name__, repr(value)
+        except ZeroDivisionError:
+            return 'ZeroDivisionError'
+    
+    checked = mismatches = 0
+    for _ in range(count):
+        text = " ".join(rng.choice(pieces) for _ in range(rng.randint(1, 14)))
+        try:
+            ast = parse_text(text, IterativeParser)
+        except Exception:
+            continue
+        int_variables = rng.random() < 0.5
+        folded, _ = fold_constants(ast, int_variables)
+        values = [0, 1, -1, 3] if int_variables else float_values
+        env = {'a': rng.choice(values), 'b': rng.choice(values)}
+        checked += 1
+        if outcome(ast, env) != outcome(folded, env):
+            mismatches += 1
+            print(f"  Beda: '{text}' dengan {env}")
+    print(f"Uji diferensial constant folding: {checked} AST, {mismatches} beda")
+    return mismatches
+
+
+# ==================== PARSE CACHE ====================
+
+def ast_size(text, node):
+    """Perkiraan byte satu entri cache: teks plus semua node dan token AST"""
+    size = sys.getsizeof(text)
+    stack = [node] if node is not None else []
+    while stack:
+        current = stack.pop()
+        size += sys.getsizeof(current)
+        if isinstance(current, BinOpNode):
+            size += sys.getsizeof(current.op_token)
+            stack.append(current.left_node)
+            stack.append(current.right_node)
+        elif isinstance(current, VarAssignNode):
+            size += sys.getsizeof(current.var_name_token)
+            stack.append(current.value_node)
+        elif isinstance(current, NumberNode):
+            size += sys.getsizeof(current.token)
+        else:
+            size += sys.getsizeof(current.var_name_token)
+    return size
+
+
+def load_shared(name):
+    """Muat '<name> - Teori Otomata.py' dari folder yang sama, sekali per
+    proses (modul didaftarkan di sys.modules)"""
+    module_name = f"teori_otomata_{name.lower()}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            f"{name} - Teori Otomata.py")
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+# Satu implementasi ParseCache dipakai bersama Pertemuan 10 dan 12
+ParseCache = load_shared("Cache").ParseCache
+
+
+def zipf_workload(formulas, count, exponent=1.1, seed=0):
+    """Urutan permintaan dengan distribusi Zipf atas daftar formula"""
+    rng = random.Random(seed)
+    weights = [1 / rank ** exponent for rank in range(1, len(formulas) + 1)]
+    return rng.choices(formulas, weights=weights, k=count)
+
+
+def benchmark_parse_cache(distinct=2000, requests=200000, max_size=1024):
+    """Bandingkan parse_text() tanpa cache dengan ParseCache pada beban Zipf"""
+    formulas = [f"f{i} = (a{i} + b) * (c - {i}) / 2 + price * {i}.5"
+                for i in range(distinct)]
+    workload = zipf_workload(formulas, requests)
+    print(f"Benchmark parse cache: {requests} permintaan, {distinct} formula, "
+          f"max_size={max_size}")
+    
+    start = time.perf_counter()
+    for text in workload:
+        parse_text(text)
+    uncached = time.perf_counter() - start
+    print(f"  {'tanpa cache':<12} {requests / uncached:12.0f} parse/detik")
+    
+    cache = ParseCache(parse_text, ast_size, max_size=max_size)
+    start = time.perf_counter()
+    for text in workload:
+        cache.get(text)
+    cached = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"  {'ParseCache':<12} {requests / cached:12.0f} parse/detik  "
+          f"(hit rate {stats['hits'] / requests:.1%}, {stats['evictions']} eviction)")
+    return stats
+
+
+def benchmark_hash_consing(count=20000):
+    """Ukur memori korpus AST biasa versus AST hash-consed (tracemalloc)"""
+    templates = ["total{i} = price * quantity + tax * {j}",
+                 "area{i} = pi * radius * radius + (a + b) * {j}",
+                 "net{i} = -(gross - discount) / 2 + (a + b) * (c - d)"]
+    texts = [templates[i % len(templates)].format(i=i % 50, j=i % 10)
+             for i in range(count)]
+    print(f"Benchmark hash-consing: {count} formula")
+    
+    results = {}
+    for name, factory in (("AST biasa", None), ("hash-consed", HashConsFactory())):
+        tracemalloc.start()
+        corpus = [parse_text(text, factory=factory) for text in texts]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = current
+        print(f"  {name:<12} {current / 1024 / 1024:8.2f} MB")
+        del corpus
+    
+    print(f"  Sharing: {factory.stats()}")
+    return results
+
+
+# ==================== BINARY AST FORMAT ====================
+
+# Layout file (little-endian); semua tabel lebar tetap sehingga bisa dibaca
+# langsung dari mmap tanpa decode di awal:
+#   header     : magic, jumlah formula, jumlah word kode, jumlah konstanta, jumlah nama
+#   nilai      : 8 byte per konstanta (int64, float64, atau offset int besar)
+#   offsets    : uint32 per formula, indeks word pertama formula di kode
+#   kode       : uint32 per instruksi postfix, berisi operand << OP_BITS | opcode
+#   nama       : uint32 offset akhir per nama di blob nama
+#   tag        : 1 byte tipe per konstanta
+#   blob nama  : UTF-8 semua identifier berurutan
+#   blob int   : int besar (di luar int64) sebagai panjang uint32 + byte
+AST_MAGIC = b'AST1'
+AST_HEADER = struct.Struct('<4sIIII')
+
+OP_CONST, OP_VAR, OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_ASSIGN = range(7)
+OP_BITS = 3
+OP_MASK = (1 << OP_BITS) - 1
+BINARY_OPCODES = {TT_PLUS: OP_ADD, TT_MINUS: OP_SUB, TT_MUL: OP_MUL, TT_DIV: OP_DIV}
+OPCODE_TOKENS = {opcode: OPERATOR_TOKENS[OPERATOR_SYMBOLS[type]]
+                 for type, opcode in BINARY_OPCODES.items()}
+
+CONST_INT, CONST_FLOAT, CONST_BIGINT = range(3)
+
+
+def little_endian(column):
+    """Byte kolom array dalam urutan little-endian"""
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def dumps_ast(nodes):
+    """Serialisasi list AST (assignment atau ekspresi) ke bytes"""
+    constants = {}      # (tipe, repr) -> indeks, agar 1, 1.0 dan -0.0 terpisah
+    pool = []
+    names = {}
+    offsets = array('I')
+    code = array('I')
+    
+    for node in nodes:
+        offsets.append(len(code))
+        target = None
+        if isinstance(node, VarAssignNode):
+            target = node.var_name_token.value
+            node = node.value_node
+        
+        stack = [(node, False)]
+        while stack:
+            current, visited = stack.pop()
+            if isinstance(current, BinOpNode):
+                if visited:
+                    code.append(BINARY_OPCODES[current.op_token.type])
+                else:
+                    stack.append((current, True))
+                    stack.append((current.right_node, False))
+                    stack.append((current.left_node, False))
+            elif isinstance(current, NumberNode):
+                value = current.value
+                key = (type(value), repr(value))
+                index = constants.get(key)
+                if index is None:
+                    index = constants[key] = len(pool)
+                    pool.append(value)
+                code.append(index << OP_BITS | OP_CONST)
+            else:
+                index = names.setdefault(current.var_name_token.value, len(names))
+                code.append(index << OP_BITS | OP_VAR)
+        
+        if target is not None:
+            code.append(names.setdefault(target, len(names)) << OP_BITS | OP_ASSIGN)
+    
+    values = bytearray()
+    tags = bytearray()
+    bigints = bytearray()
+    for value in pool:
+        if isinstance(value, float):
+            values += struct.pack('<d', value)
+            tags.append(CONST_FLOAT)
+        elif -2**63 <= value < 2**63:
+            values += struct.pack('<q', value)
+            tags.append(CONST_INT)
+        else:
+            data = value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+            values += struct.pack('<q', len(bigints))
+            tags.append(CONST_BIGINT)
+            bigints += struct.pack('<I', len(data)) + data
+    
+    name_blob = bytearray()
+    name_ends = array('I')
+    for name in names:
+        name_blob += name.encode('utf-8')
+        name_ends.append(len(name_blob))
+    
+    header = AST_HEADER.pack(AST_MAGIC, len(offsets), len(code), len(pool), len(names))
+    return b''.join((header, values, little_endian(offsets), little_endian(code),
+                     little_endian(name_ends), tags, name_blob, bigints))
+
+
+def dump_ast(nodes, path):
+    """Tulis list AST ke file format biner"""
+    with open(path, 'wb') as file:
+        file.write(dumps_ast(nodes))
+
+
+class ASTLibrary:
+    """Pustaka AST biner. Membuka file hanya membaca header dan membuat view
+    ke tiap tabel (tanpa decode); token konstanta/nama dan node sebuah
+    formula baru dibangun saat formula itu diakses"""
+    
+    def __init__(self, buffer):
+        self.buffer = buffer
+        if len(buffer) < AST_HEADER.size:
+            raise ASTFormatError("File AST biner terpotong: header tidak lengkap")
+        magic, formulas, words, constants, names = AST_HEADER.unpack_from(buffer, 0)
+        if magic != AST_MAGIC:
+            raise ASTFormatError("Bukan file AST biner")
+        tables = AST_HEADER.size + 9 * constants + 4 * (formulas + words + names)
+        if len(buffer) < tables:
+            raise ASTFormatError("File AST biner terpotong: tabel tidak lengkap")
+        
+        self.view = memoryview(buffer)
+        sections = {}
+        pos = AST_HEADER.size
+        for section, size in (('values', 8 * constants), ('offsets', 4 * formulas),
+                              ('code', 4 * words), ('name_ends', 4 * names),
+                              ('tags', constants)):
+            sections[section] = self.view[pos:pos + size]
+            pos += size
+        
+        self.tags = sections['tags']
+        self.ints = sections['values'].cast('q')
+        self.floats = sections['values'].cast('d')
+        self.offsets = sections['offsets'].cast('I')
+        self.code = sections['code'].cast('I')
+        self.name_ends = sections['name_ends'].cast('I')
+        if sys.byteorder == 'big':
+            for column in ('ints', 'floats', 'offsets', 'code', 'name_ends'):
+                swapped = array(getattr(self, column).format, getattr(self, column))
+                swapped.byteswap()
+                setattr(self, column, swapped)
+        
+        self.names_start = pos
+        self.bigints_start = pos + (self.name_ends[-1] if names else 0)
+        if len(buffer) < self.bigints_start:
+            raise ASTFormatError("File AST biner terpotong: nama tidak lengkap")
+        
+        # Token dibuat saat pertama kali dipakai, lalu dipakai bersama
+        self.number_tokens = [None] * constants
+        self.name_tokens = [None] * names
+    
+    @classmethod
+    def open(cls, path):
+        """Buka file lewat mmap (read-only)"""
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+    
+    def close(self):
+        """Lepaskan semua view lalu tutup mmap (jika buffer berupa mmap)"""
+        for column in (self.tags, self.ints, self.floats, self.offsets,
+                       self.code, self.name_ends, self.view):
+            if isinstance(column, memoryview):
+                column.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def number_token(self, index):
+        token = self.number_tokens[index]
+        if token is None:
+            tag = self.tags[index]
+            if tag == CONST_FLOAT:
+                token = Token(TT_FLOAT, self.floats[index])
+            elif tag == CONST_INT:
+                token = Token(TT_INT, self.ints[index])
+            else:
+                pos = self.bigints_start + self.ints[index]
+                if pos + 4 > len(self.buffer):
+                    raise ASTFormatError("File AST biner terpotong: integer besar")
+                length = struct.unpack_from('<I', self.buffer, pos)[0]
+                if pos + 4 + length > len(self.buffer):
+                    raise ASTFormatError("File AST biner terpotong: integer besar")
+                data = self.view[pos + 4:pos + 4 + length]
+                token = Token(TT_INT, int.from_bytes(data, 'little', signed=True))
+            self.number_tokens[index] = token
+        return token
+    
+    def name_token(self, index):
+        token = self.name_tokens[index]
+        if token is None:
+            start = self.name_ends[index - 1] if index else 0
+            data = self.view[self.names_start + start:self.names_start + self.name_ends[index]]
+            token = self.name_tokens[index] = Token(TT_IDENTIFIER, str(data, 'utf-8'))
+        return token
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+    
+    def __getitem__(self, index):
+        """Bangun AST formula ke-index dari kode postfix"""
+        if index < 0:
+            index += len(self)
+        start = self.offsets[index]
+        stop = self.offsets[index + 1] if index + 1 < len(self) else len(self.code)
+        
+        stack = []
+        for word in self.code[start:stop].tolist():
+            opcode = word & OP_MASK
+            if opcode == OP_CONST:
+                stack.append(NumberNode(self.number_token(word >> OP_BITS)))
+            elif opcode == OP_VAR:
+                stack.append(VarAccessNode(self.name_token(word >> OP_BITS)))
+            elif opcode == OP_ASSIGN:
+                stack.append(VarAssignNode(self.name_token(word >> OP_BITS), stack.pop()))
+            else:
+                right = stack.pop()
+                stack[-1] = BinOpNode(stack[-1], OPCODE_TOKENS[opcode], right)
+        return stack.pop()
+    
+    def __repr__(self):
+        return (f"ASTLibrary({len(self)} formula, {len(self.number_tokens)} konstanta, "
+                f"{len(self.name_tokens)} nama)")
+
+
+def load_ast(path):
+    """Baca seluruh formula dari file format biner"""
+    with ASTLibrary.open(path) as library:
+        return list(library)
+
+
+def random_formula(rng, terms=6):
+    """Teks formula acak untuk uji dan benchmark"""
+    parts = []
+    for _ in range(terms):
+        kind = rng.random()
+        if kind < 0.3:
+            parts.append(rng.choice(['harga', 'qty', 'pajak', 'diskon', 'r']))
+        elif kind < 0.6:
+            parts.append(str(rng.randint(0, 10**25 if rng.random() < 0.1 else 100)))
+        elif kind < 0.8:
+            parts.append(f"{rng.randint(0, 99)}.{rng.randint(0, 99)}")
+        else:
+            parts.append(f"-({rng.choice(['a', '1', '2.5'])} / {rng.randint(1, 9)})")
+    text = parts[0]
+    for part in parts[1:]:
+        text += f" {rng.choice('+-*/')} {part}"
+    if rng.random() < 0.7:
+        text = f"f{rng.randint(0, 999)} = {text}"
+    return text
+
+
+def verify_ast_serialization(count=5000, seed=0):
+    """Uji round-trip: AST -> biner (lewat file dan mmap) -> AST harus
+    menghasilkan struktur, nilai, dan tipe angka yang sama"""
+    rng = random.Random(seed)
+    nodes = [parse_text(random_formula(rng, rng.randint(1, 8))) for _ in range(count)]
+    nodes.append(parse_text("x = 0.0 - -0.0 * 1 / 1.0"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "formulas.ast")
+        dump_ast(nodes, path)
+        loaded = load_ast(path)
+    
+    mismatches = 0
+    for original, copy in zip(nodes, loaded):
+        if repr(original) != repr(copy):
+            mismatches += 1
+            print(f"  Beda: {original} != {copy}")
+    mismatches += abs(len(nodes) - len(loaded))
+    print(f"Uji round-trip AST biner: {len(nodes)} formula, {mismatches} beda")
+    return mismatches
+
+
+def benchmark_ast_format(count=50000):
+    """Waktu load pustaka formula: parse ulang teks versus file biner"""
+    rng = random.Random(0)
+    texts = [random_formula(rng) for _ in range(count)]
+    text_bytes = sum(len(text) + 1 for text in texts)
+    
+    start = time.perf_counter()
+    nodes = [parse_text(text) for text in texts]
+    reparse = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "formulas.ast")
+        dump_ast(nodes, path)
+        print(f"Benchmark AST biner: {count} formula, teks {text_bytes / 1024:.0f} KB, "
+              f"biner {os.path.getsize(path) / 1024:.0f} KB")
+        
+        start = time.perf_counter()
+        with ASTLibrary.open(path) as library:
+            opened = time.perf_counter() - start
+            library[count // 2]
+            single = time.perf_counter() - start
+            loaded = list(library)
+        full = time.perf_counter() - start
+    
+    print(f"  {'parse ulang teks':<22} {reparse * 1000:9.2f} ms")
+    print(f"  {'load biner (semua)':<22} {full * 1000:9.2f} ms  ({reparse / full:.1f}x)")
+    print(f"  {'buka mmap saja':<22} {opened * 1000:9.2f} ms")
+    print(f"  {'buka + 1 formula':<22} {single * 1000:9.2f} ms")
+    return len(loaded)
+
+
+# ==================== FLAT AST ====================
+
+OPCODE_SYMBOLS = {opcode: OPERATOR_SYMBOLS[type] for type, opcode in BINARY_OPCODES.items()}
+
+
+class FlatAST:
+    """AST datar: instruksi postfix di dua array bertipe paralel (opcode dan
+    operand) ditambah tabel konstanta dan nama; tidak ada objek per node.
+    Opcode sama dengan format biner (OP_CONST, OP_VAR, OP_ADD, ...)"""
+    __slots__ = ('ops', 'args', 'constants', 'names')
+    
+    def __init__(self):
+        self.ops = array('B')
+        self.args = array('I')      # Indeks ke constants/names (0 untuk operator)
+        self.constants = []
+        self.names = []
+    
+    def constant(self, value):
+        self.ops.append(OP_CONST)
+        self.args.append(len(self.constants))
+        self.constants.append(value)
+    
+    def name(self, opcode, name):
+        """Tulis OP_VAR atau OP_ASSIGN untuk identifier name"""
+        self.ops.append(opcode)
+        self.args.append(len(self.names))
+        self.names.append(name)
+    
+    def operator(self, opcode):
+        self.ops.append(opcode)
+        self.args.append(0)
+    
+    def __len__(self):
+        return len(self.ops)
+    
+    def postfix(self):
+        """Teks postfix, misal 'pi r * r * =area'"""
+        parts = []
+        for op, arg in zip(self.ops, self.args):
+            if op == OP_CONST:
+                parts.append(repr(self.constants[arg]))
+            elif op == OP_VAR:
+                parts.append(self.names[arg])
+            elif op == OP_ASSIGN:
+                parts.append(f"={self.names[arg]}")
+            else:
+                parts.append(OPCODE_SYMBOLS[op])
+        return " ".join(parts)
+    
+    def __repr__(self):
+        return f"FlatAST({self.postfix()})"
+    
+    def evaluate(self, env):
+        """Evaluasi dengan stack machine; semantik sama dengan evaluate()"""
+        constants = self.constants
+        names = self.names
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for op, arg in zip(self.ops, self.args):
+            if op == OP_CONST:
+                push(constants[arg])
+            elif op == OP_VAR:
+                push(env[names[arg]])
+            elif op == OP_ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+            elif op == OP_SUB:
+                right = pop()
+                stack[-1] = stack[-1] - right
+            elif op == OP_MUL:
+                right = pop()
+                stack[-1] = stack[-1] * right
+            elif op == OP_DIV:
+                right = pop()
+                stack[-1] = stack[-1] / right
+        return pop()
+    
+    @classmethod
+    def from_node(cls, node):
+        """Konversi pohon node ke FlatAST (postorder tanpa rekursi)"""
+        flat = cls()
+        target = None
+        if isinstance(node, VarAssignNode):
+            target = node.var_name_token.value
+            node = node.value_node
+        
+        stack = [(node, False)]
+        while stack:
+            current, visited = stack.pop()
+            if isinstance(current, BinOpNode):
+                if visited:
+                    flat.operator(BINARY_OPCODES[current.op_token.type])
+                else:
+                    stack.append((current, True))
+                    stack.append((current.right_node, False))
+                    stack.append((current.left_node, False))
+            elif isinstance(current, NumberNode):
+                flat.constant(current.value)
+            else:
+                flat.name(OP_VAR, current.var_name_token.value)
+        
+        if target is not None:
+            flat.name(OP_ASSIGN, target)
+        return flat
+    
+    def to_node(self):
+        """Bangun kembali pohon node dari instruksi postfix"""
+        stack = []
+        for op, arg in zip(self.ops, self.args):
+            if op == OP_CONST:
+                value = self.constants[arg]
+                stack.append(NumberNode(Token(TT_FLOAT if isinstance(value, float) else TT_INT, value)))
+            elif op == OP_VAR:
+                stack.append(VarAccessNode(Token(TT_IDENTIFIER, self.names[arg])))
+            elif op == OP_ASSIGN:
+                stack.append(VarAssignNode(Token(TT_IDENTIFIER, self.names[arg]), stack.pop()))
+            else:
+                right = stack.pop()
+                stack[-1] = BinOpNode(stack[-1], OPCODE_TOKENS[op], right)
+        return stack.pop()
+
+
+class FlatParser(Parser):
+    """Parser yang langsung menulis instruksi postfix ke FlatAST tanpa
+    membuat node; grammar dan bentuk pohon (termasuk unary sebagai 0 - x)
+    sama dengan Parser. Setiap method mengembalikan FlatAST yang sama"""
+    
+    def __init__(self, lexer):
+        super().__init__(lexer)
+        self.flat = FlatAST()
+    
+    def atom(self):
+        """atom : INT | FLOAT | IDENTIFIER | LPAREN expr RPAREN"""
+        token = self.current_token
+        if token.type == TT_INT or token.type == TT_FLOAT:
+            self.eat(token.type)
+            self.flat.constant(token.value)
+        elif token.type == TT_IDENTIFIER:
+            self.eat(TT_IDENTIFIER)
+            self.flat.name(OP_VAR, token.value)
+        elif token.type == TT_LPAREN:
+            self.eat(TT_LPAREN)
+            self.expr()
+            self.eat(TT_RPAREN)
+        else:
+            self.error("Expected INT, FLOAT, IDENTIFIER, or LPAREN")
+        return self.flat
+    
+    def factor(self):
+        """factor : (PLUS | MINUS) factor | atom"""
+        token = self.current_token
+        if token.type in (TT_PLUS, TT_MINUS):
+            self.eat(token.type)
+            self.flat.constant(0)
+            self.factor()
+            self.flat.operator(BINARY_OPCODES[token.type])
+            return self.flat
+        return self.atom()
+    
+    def term(self):
+        """term : factor ((MUL | DIV) factor)*"""
+        self.factor()
+        while self.current_token.type in (TT_MUL, TT_DIV):
+            op_token = self.current_token
+            self.eat(op_token.type)
+            self.factor()
+            self.flat.operator(BINARY_OPCODES[op_token.type])
+        return self.flat
+    
+    def expr(self):
+        """expr : term ((PLUS | MINUS) term)*"""
+        self.term()
+        while self.current_token.type in (TT_PLUS, TT_MINUS):
+            op_token = self.current_token
+            self.eat(op_token.type)
+            self.term()
+            self.flat.operator(BINARY_OPCODES[op_token.type])
+        return self.flat
+    
+    def statement(self):
+        """statement : IDENTIFIER EQ expr | expr"""
+        if self.current_token.type == TT_IDENTIFIER and self.peek().type == TT_EQ:
+            var_name_token = self.current_token
+            self.eat(TT_IDENTIFIER)
+            self.eat(TT_EQ)
+            self.expr()
+            self.flat.name(OP_ASSIGN, var_name_token.value)
+            return self.flat
+        return self.expr()
+
+
+def parse_flat(text):
+    """Parse satu statement langsung ke FlatAST; error dilempar"""
+    return parse_text(text, FlatParser)
+
+
+def verify_flat_ast(count=5000, seed=0):
+    """Uji diferensial: FlatParser vs Parser (bentuk postfix, konversi dua
+    arah, dan hasil evaluasi termasuk ZeroDivisionError)"""
+    rng = random.Random(seed)
+    env = {'harga': 3, 'qty': 0, 'pajak': 0.5, 'diskon': -2, 'r': 7, 'a': 0.0}
+    
+    def outcome(run):
+        try:
+            value = run()
+            return type(value).__name__, repr(value)
+        except ZeroDivisionError:
+            return 'ZeroDivisionError'
+    
+    mismatches = 0
+    for _ in range(count):
+        text = random_formula(rng, rng.randint(1, 8))
+        tree = parse_text(text)
+        flat = parse_flat(text)
+        converted = FlatAST.from_node(tree)
+        if (flat.postfix() != converted.postfix()
+                or repr(flat.to_node()) != repr(tree)
+                or outcome(lambda: flat.evaluate(env)) != outcome(lambda: evaluate(tree, env))):
+            mismatches += 1
+            print(f"  Beda: '{text}'")
+    print(f"Uji diferensial FlatAST: {count} formula, {mismatches} beda")
+    return mismatches
+
+
+def benchmark_flat_ast(count=20000, runs=5):
+    """Pohon node versus FlatAST: waktu parse, memori yang tertahan,
+    traversal (repr versus postfix), dan evaluasi"""
+    rng = random.Random(0)
+    texts = [random_formula(rng, 12) for _ in range(count)]
+    env = {'harga': 3, 'qty': 2, 'pajak': 0.5, 'diskon': -2, 'r': 7, 'a': 1.5}
+    print(f"Benchmark FlatAST: {count} formula, evaluasi dan traversal x{runs}")
+    
+    def evaluate_all(run, asts):
+        for ast in asts:
+            try:
+                run(ast)
+            except ZeroDivisionError:
+                pass
+    
+    cases = (
+        ("pohon node", parse_text, repr, lambda ast: evaluate(ast, env)),
+        ("FlatAST", parse_flat, FlatAST.postfix, lambda ast: ast.evaluate(env)),
+    )
+    for name, parse, show, run in cases:
+        start = time.perf_counter()
+        asts = [parse(text) for text in texts]
+        parse_time = time.perf_counter() - start
+        
+        del asts
+        tracemalloc.start()
+        asts = [parse(text) for text in texts]
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        start = time.perf_counter()
+        for _ in range(runs):
+            for ast in asts:
+                show(ast)
+        traverse_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(runs):
+            evaluate_all(run, asts)
+        evaluate_time = time.perf_counter() - start
+        print(f"  {name:<11} parse {parse_time * 1000:7.1f} ms   memori {memory / 1024 / 1024:6.2f} MB   "
+              f"traversal {traverse_time * 1000:7.1f} ms   evaluasi {evaluate_time * 1000:7.1f} ms")
+
+
+# ==================== ERROR RECOVERY ====================
+
+# Satu diagnostik: offset karakter, jenis ('lexer' atau 'syntax') dan pesan
+Diagnostic = namedtuple('Diagnostic', ('position', 'kind', 'message'))
+
+
+class RecoveringLexer(FastLexer):
+    """FastLexer yang mencatat offset awal token terakhir (start) dan tidak
+    berhenti pada karakter tidak valid: karakter dicatat di diagnostics
+    lalu dilewati"""
+    def __init__(self, text):
+        super().__init__(text)
+        self.start = 0
+        self.diagnostics = []
+    
+    def error(self):
+        """Lewati karakter tidak valid sampai ketemu token atau EOF"""
+        text = self.text
+        while True:
+            pos = self.whitespace_pattern.match(text, self.pos).end()
+            self.pos = self.start = pos
+            if pos >= len(text):
+                return Token(TT_EOF, None)
+            if self.token_pattern.match(text, pos) is not None:
+                return self.get_next_token()
+            self.diagnostics.append(
+                Diagnostic(pos, 'lexer', f"Karakter tidak valid: '{text[pos]}'"))
+            self.pos = pos + 1
+    
+    def get_next_token(self):
+        match = self.token_pattern.match(self.text, self.pos)
+        if match is None:
+            return self.error()
+        
+        self.start = match.start(match.lastindex)
+        self.pos = match.end()
+        number, fraction, name, operator = match.groups()
+        if number is not None:
+            if fraction is not None:
+                return Token(TT_FLOAT, float(number))
+            return Token(TT_INT, int(number))
+        if name is not None:
+            return Token(TT_IDENTIFIER, name)
+        return self.operator_tokens[operator]
+
+
+class RecoveringProgramLexer(RecoveringLexer):
+    """RecoveringLexer untuk program multi-statement"""
+    token_pattern = PROGRAM_TOKEN_PATTERN
+    whitespace_pattern = PROGRAM_WHITESPACE_PATTERN
+    operator_tokens = PROGRAM_OPERATOR_TOKENS
+
+
+class RecoveringParser(Parser):
+    """Parser dengan pemulihan error panic-mode: error() mencatat Diagnostic
+    tanpa melempar, operand yang hilang diganti None, dan token sisa
+    disinkronkan di ')', ';' / newline, atau EOF. Setiap token dikonsumsi
+    sekali sehingga semua error ditemukan dalam satu pass linear.
+    Lexer harus RecoveringLexer (atau turunannya)"""
+    
+    def __init__(self, lexer):
+        self.diagnostics = lexer.diagnostics
+        self.starts = deque()       # Offset token di buffer lookahead
+        super().__init__(lexer)
+        self.position = lexer.start  # Offset current_token
+    
+    def error(self, message="Syntax error"):
+        """Catat error di offset token saat ini (satu per offset)"""
+        diagnostics = self.diagnostics
+        if diagnostics and diagnostics[-1].position == self.position:
+            return
+        diagnostics.append(Diagnostic(self.position, 'syntax',
+                                      f"{message} pada token: {self.current_token}"))
+    
+    def peek(self, n=0):
+        lookahead = self.lookahead
+        while len(lookahead) <= n:
+            lookahead.append(self.lexer.get_next_token())
+            self.starts.append(self.lexer.start)
+        return lookahead[n]
+    
+    def eat(self, token_type):
+        """Seperti Parser.eat, sekaligus memperbarui position"""
+        if self.current_token.type == token_type:
+            if self.lookahead:
+                self.current_token = self.lookahead.popleft()
+                self.position = self.starts.popleft()
+            else:
+                self.current_token = self.lexer.get_next_token()
+                self.position = self.lexer.start
+        else:
+            self.error(f"Expected {token_type}, got {self.current_token.type}")
+    
+    def atom(self):
+        """atom : INT | FLOAT | IDENTIFIER | LPAREN expr RPAREN"""
+        if self.current_token.type == TT_LPAREN:
+            self.eat(TT_LPAREN)
+            expr_node = self.expr()
+            self.synchronize(TT_RPAREN)
+            self.eat(TT_RPAREN)
+            return expr_node
+        return super().atom()
+    
+    def synchronize(self, closer):
+        """Panic mode: token yang tidak bisa melanjutkan ekspresi dilaporkan
+        sekali, lalu sisa token sampai closer, SEMI, atau EOF di-parse
+        sebagai ekspresi agar error di dalamnya tetap ditemukan"""
+        reported = False
+        while self.current_token.type not in (closer, TT_SEMI, TT_EOF):
+            if not reported:
+                self.error("Unexpected token")
+                reported = True
+            if self.current_token.type in (TT_RPAREN, TT_EQ):
+                self.eat(self.current_token.type)
+            else:
+                # Operator tanpa operand kiri dikonsumsi oleh term()/expr()
+                self.expr()
+    
+    def program(self):
+        """program : statement (SEMI statement)*  dengan sinkronisasi per statement"""
+        statements = []
+        while self.current_token.type != TT_EOF:
+            if self.current_token.type == TT_SEMI:
+                self.eat(TT_SEMI)
+                continue
+            statements.append(self.statement())
+            self.synchronize(TT_SEMI)
+        return ProgramNode(statements)
+
+
+def diagnose(text):
+    """Cari semua error lexer dan syntax satu statement dalam satu pass
+    tanpa print. Kembalikan list Diagnostic urut offset (kosong jika valid)"""
+    parser = RecoveringParser(RecoveringLexer(text))
+    parser.statement()
+    parser.synchronize(TT_EOF)
+    parser.diagnostics.sort(key=lambda diagnostic: diagnostic.position)
+    return parser.diagnostics
+
+
+def diagnose_program(text):
+    """diagnose() untuk program multi-statement (pemisah ';' atau newline)"""
+    parser = RecoveringParser(RecoveringProgramLexer(text))
+    parser.program()
+    parser.diagnostics.sort(key=lambda diagnostic: diagnostic.position)
+    return parser.diagnostics
+
+
+def benchmark_diagnose(sizes=(1000, 10000, 100000)):
+    """Waktu diagnose_program() per statement pada file formula yang separuh
+    barisnya rusak; waktu per statement harus tetap (linear, bukan kuadratik)"""
+    samples = ["total = price * qty + tax", "x = 10 + * 2", "y = (a + b * c",
+               "area = pi * r * r", "z = a b ) + 1", "= 100", "w = (a + #) / 2"]
+    print("Benchmark diagnose_program: file formula penuh error")
+    for size in sizes:
+        text = "\n".join(samples[i % len(samples)] for i in range(size))
+        start = time.perf_counter()
+        diagnostics = diagnose_program(text)
+        elapsed = time.perf_counter() - start
+        print(f"  {size:>7} statement: {len(diagnostics):>7} error   "
+              f"{elapsed / size * 1e6:6.2f} us/statement")
+
+
+# ==================== INSTRUMENTATION ====================
+
+# Method lexer per karakter yang diukur (jumlah panggilan dan waktu inklusif)
+LEXER_METHODS = ('advance', 'skip_whitespace', 'integer', 'identifier')
+
+# Rule parser yang dihitung kedalaman rekursinya
+PARSER_RULES = ('program', 'statement', 'expr', 'term', 'factor', 'atom')
+
+
+class Profile:
+    """Counter dan timer dari kelas ber-instrumen (lihat instrument()).
+    Tidak thread-safe: satu Profile untuk satu thread. sink, jika ada,
+    dipanggil dengan Profile ini setiap satu parse level teratas selesai"""
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.tokens = Counter()     # Tipe token -> jumlah
+        self.chars = 0              # Karakter yang dilewati lexer
+        self.eats = 0
+        self.calls = Counter()      # Rule parser -> jumlah panggilan
+        self.methods = {}           # Method lexer -> [panggilan, detik]
+        self.depth = 0
+        self.max_depth = 0
+        self.parses = 0
+        self.lex_time = 0.0
+        self.parse_time = 0.0       # Waktu parse di luar lexer
+    
+    def timed(self, name, method):
+        """Bungkus method lexer dengan counter panggilan dan timer"""
+        stats = self.methods.setdefault(name, [0, 0.0])
+        perf_counter = time.perf_counter
+        
+        def wrapper(lexer, *args):
+            start = perf_counter()
+            try:
+                return method(lexer, *args)
+            finally:
+                stats[0] += 1
+                stats[1] += perf_counter() - start
+        return wrapper
+    
+    def rule(self, name, method):
+        """Bungkus rule parser dengan counter panggilan dan kedalaman;
+        rule terluar juga mengukur waktu fase parse"""
+        profile = self
+        perf_counter = time.perf_counter
+        
+        def wrapper(parser, *args):
+            profile.calls[name] += 1
+            depth = profile.depth = profile.depth + 1
+            if depth > profile.max_depth:
+                profile.max_depth = depth
+            if depth == 1:
+                start = perf_counter()
+                lex_start = profile.lex_time
+            try:
+                return method(parser, *args)
+            finally:
+                profile.depth = depth - 1
+                if depth == 1:
+                    lexing = profile.lex_time - lex_start
+                    profile.parse_time += perf_counter() - start - lexing
+                    profile.parses += 1
+                    if profile.sink is not None:
+                        profile.sink(profile)
+        return wrapper
+    
+    def as_dict(self):
+        """Ringkasan siap JSON"""
+        return {
+            'parses': self.parses,
+            'tokens': dict(self.tokens),
+            'chars': self.chars,
+            'eats': self.eats,
+            'calls': dict(self.calls),
+            'methods': {name: {'calls': calls, 'seconds': seconds}
+                        for name, (calls, seconds) in self.methods.items()},
+            'max_depth': self.max_depth,
+            'lex_seconds': self.lex_time,
+            'parse_seconds': self.parse_time,
+        }
+    
+    def __repr__(self):
+        return (f"Profile({self.parses} parse, {sum(self.tokens.values())} token, "
+                f"{self.chars} karakter, {self.eats} eat, kedalaman {self.max_depth}, "
+                f"lex {self.lex_time * 1000:.1f} ms, parse {self.parse_time * 1000:.1f} ms)")
+
+
+def instrument(parser_class=Parser, lexer_class=FastLexer, profile=None):
+    """Buat subclass ber-instrumen dari parser_class dan lexer_class yang
+    mencatat ke profile. Kelas aslinya tidak diubah, jadi tanpa instrumentasi
+    tidak ada overhead sama sekali. Kembalikan (parser, lexer, profile)"""
+    profile = profile or Profile()
+    perf_counter = time.perf_counter
+    
+    class InstrumentedLexer(lexer_class):
+        def get_next_token(self):
+            pos = self.pos
+            start = perf_counter()
+            token = super().get_next_token()
+            profile.lex_time += perf_counter() - start
+            profile.chars += self.pos - pos
+            profile.tokens[token.type] += 1
+            return token
+    
+    class InstrumentedParser(parser_class):
+        def eat(self, token_type):
+            profile.eats += 1
+            return super().eat(token_type)
+    
+    for name in LEXER_METHODS:
+        method = getattr(lexer_class, name, None)
+        if method is not None:
+            setattr(InstrumentedLexer, name, profile.timed(name, method))
+    for name in PARSER_RULES:
+        setattr(InstrumentedParser, name, profile.rule(name, getattr(parser_class, name)))
+    
+    InstrumentedLexer.__name__ = f"Instrumented{lexer_class.__name__}"
+    InstrumentedParser.__name__ = f"Instrumented{parser_class.__name__}"
+    return InstrumentedParser, InstrumentedLexer, profile
+
+
+def profile_parse(texts, parser_class=Parser, lexer_class=FastLexer, sink=None):
+    """Parse setiap statement di texts dengan kelas ber-instrumen;
+    kembalikan (jumlah error, Profile)"""
+    parser_class, lexer_class, profile = instrument(parser_class, lexer_class, Profile(sink))
+    errors = 0
+    for text in texts:
+        try:
+            parser = parser_class(lexer_class(text))
+            parser.statement()
+            if parser.current_token.type != TT_EOF:
+                parser.error("Unexpected tokens at the end")
+        except (LexerError, ParseError):
+            errors += 1
+    return errors, profile
+
+
+def benchmark_instrumentation(count=20000):
+    """Overhead instrumentasi: kelas asli (nonaktif) versus ber-instrumen"""
+    rng = random.Random(0)
+    texts = [random_formula(rng, 12) for _ in range(count)]
+    print(f"Benchmark instrumentasi: {count} formula")
+    
+    start = time.perf_counter()
+    for text in texts:
+        parse_text(text)
+    plain = time.perf_counter() - start
+    print(f"  {'nonaktif':<14} {count / plain:10.0f} formula/detik")
+    
+    for lexer_class in (FastLexer, Lexer):
+        start = time.perf_counter()
+        _, profile = profile_parse(texts, lexer_class=lexer_class)
+        elapsed = time.perf_counter() - start
+        print(f"  {lexer_class.__name__:<14} {count / elapsed:10.0f} formula/detik  "
+              f"({elapsed / plain:.1f}x)  {profile}")
+
+
+# ==================== INCREMENTAL PARSER ====================
+
+class TermEntry:
+    """Memo satu term: subtree yang bisa dipakai ulang selama token di
+    dalamnya dan token lookahead-nya tidak tersentuh edit"""
+    __slots__ = ('start_token', 'length', 'node', 'parent', 'valid')
+    
+    def __init__(self, start_token, parent):
+        self.start_token = start_token
+        self.parent = parent      # Term terdekat yang memuat term ini
+        self.length = 0           # Jumlah token yang dikonsumsi term
+        self.node = None
+        self.valid = False
+
+
+class IncrementalParser:
+    """Parser untuk teks yang diedit berulang kali (misalnya di editor).
+    edit() hanya me-lex ulang area yang rusak sampai token kembali sinkron
+    dengan token lama, lalu parse ulang dengan memakai ulang subtree term
+    yang tidak tersentuh edit"""
+    def __init__(self, text):
+        self.text = ''
+        self.tokens = []
+        self.starts = []
+        self.ends = []
+        self.memo = {}      # id(token awal term) -> TermEntry
+        self.owner = {}     # id(token) -> TermEntry terdalam yang memuatnya
+        self.stale = True   # Token harus di-lex ulang seluruhnya
+        self.eof_token = Token(TT_EOF, None)
+        self.ast = None
+        try:
+            self.edit(0, 0, text)
+        except Exception:
+            pass    # Teks awal boleh belum valid; ast tetap None
+    
+    def edit(self, offset, deleted, inserted):
+        """Hapus `deleted` karakter mulai `offset`, sisipkan `inserted`, lalu
+        kembalikan AST baru. Error lexer/parser dilempar sebagai Exception"""
+        text = self.text[:offset] + inserted + self.text[offset + deleted:]
+        delta = len(inserted) - deleted
+        if self.stale:
+            self.tokens, self.starts, self.ends = [], [], []
+            self.memo.clear()
+            self.owner.clear()
+        starts, ends = self.starts, self.ends
+        
+        # Token lama pertama yang mungkin berubah: yang berakhir di/setelah offset
+        first = bisect_left(ends, offset)
+        pos = min(starts[first], offset) if first < len(starts) else offset
+        if self.stale:
+            pos = 0
+        # Sinkronisasi hanya dengan token lama setelah area yang dihapus
+        resume = bisect_left(starts, offset + deleted)
+        
+        new_tokens, new_starts, new_ends = [], [], []
+        try:
+            while True:
+                pos = WHITESPACE_PATTERN.match(text, pos).end()
+                while resume < len(starts) and starts[resume] + delta < pos:
+                    resume += 1
+                if resume < len(starts) and starts[resume] + delta == pos:
+                    break   # Sisa token lama identik (hanya bergeser delta)
+                if pos >= len(text):
+                    break
+                token, end = self.lex_token(text, pos)
+                new_tokens.append(token)
+                new_starts.append(pos)
+                new_ends.append(end)
+                pos = end
+        except Exception:
+            self.text = text
+            self.stale = True
+            self.ast = None
+            raise
+        
+        self.invalidate(first, resume)
+        self.tokens[first:resume] = new_tokens
+        starts[first:] = new_starts + [start + delta for start in starts[resume:]]
+        ends[first:] = new_ends + [end + delta for end in ends[resume:]]
+        self.text = text
+        self.stale = False
+        
+        self.ast = None
+        self.ast = self.parse_tokens()
+        return self.ast
+    
+    def lex_token(self, text, pos):
+        """Satu token baru (bukan singleton) beserta offset akhirnya"""
+        match = TOKEN_PATTERN.match(text, pos)
+        if match is None:
+            raise LexerError(f"Karakter tidak valid: '{text[pos]}'")
+        number, fraction, name, operator = match.groups()
+        if number is not None:
+            if fraction is not None:
+                token = Token(TT_FLOAT, float(number))
+            else:
+                token = Token(TT_INT, int(number))
+        elif name is not None:
+            token = Token(TT_IDENTIFIER, name)
+        else:
+            token = Token(OPERATOR_TYPES[operator], operator)
+        return token, match.end()
+    
+    def invalidate(self, first, stop):
+        """Batalkan memo term yang menyentuh token lama [first, stop)"""
+        # Term yang memuat token tepat sebelum area rusak pasti ikut rusak
+        # (isi atau lookahead-nya berubah), begitu juga semua term induknya
+        if first > 0:
+            entry = self.owner.get(id(self.tokens[first - 1]))
+            while entry is not None and entry.valid:
+                entry.valid = False
+                entry = entry.parent
+        for token in self.tokens[first:stop]:
+            self.owner.pop(id(token), None)
+            entry = self.memo.pop(id(token), None)
+            if entry is not None:
+                entry.valid = False
+    
+    # ---------- parser di atas list token ----------
+    
+    def peek(self, offset=0):
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else self.eof_token
+    
+    def error(self, message="Syntax error"):
+        raise ParseError(f"{message} pada token: {self.peek()}")
+    
+    def eat(self, token_type):
+        token = self.peek()
+        if token.type != token_type:
+            self.error(f"Expected {token_type}, got {token.type}")
+        self.owner[id(token)] = self.entries[-1]
+        self.index += 1
+        return token
+    
+    def parse_tokens(self):
+        self.index = 0
+        self.entries = [None]   # Stack term yang sedang di-parse
+        ast = self.statement()
+        if self.peek().type != TT_EOF:
+            self.error("Unexpected tokens at the end")
+        return ast
+    
+    def statement(self):
+        """statement : IDENTIFIER EQ expr | expr (lookahead langsung di list)"""
+        if self.peek().type == TT_IDENTIFIER and self.peek(1).type == TT_EQ:
+            var_name_token = self.eat(TT_IDENTIFIER)
+            self.eat(TT_EQ)
+            return VarAssignNode(var_name_token, self.expr())
+        return self.expr()
+    
+    def expr(self):
+        node = self.term()
+        while self.peek().type in (TT_PLUS, TT_MINUS):
+            op_token = self.eat(self.peek().type)
+            node = BinOpNode(node, op_token, self.term())
+        return node
+    
+    def term(self):
+        """term dengan memo: subtree lama dipakai jika masih valid"""
+        start_token = self.peek()
+        entry = self.memo.get(id(start_token))
+        if entry is not None and entry.valid and entry.start_token is start_token:
+            self.index += entry.length
+            entry.parent = self.entries[-1]
+            return entry.node
+        
+        start = self.index
+        entry = TermEntry(start_token, self.entries[-1])
+        self.entries.append(entry)
+        node = self.factor()
+        while self.peek().type in (TT_MUL, TT_DIV):
+            op_token = self.eat(self.peek().type)
+            node = BinOpNode(node, op_token, self.factor())
+        self.entries.pop()
+        
+        entry.length = self.index - start
+        entry.node = node
+        entry.valid = True
+        self.memo[id(start_token)] = entry
+        return node
+    
+    def factor(self):
+        token = self.peek()
+        if token.type in (TT_PLUS, TT_MINUS):
+            self.eat(token.type)
+            zero_node = NumberNode(Token(TT_INT, 0))
+            return BinOpNode(zero_node, token, self.factor())
+        return self.atom()
+    
+    def atom(self):
+        token = self.peek()
+        if token.type == TT_INT or token.type == TT_FLOAT:
+            self.eat(token.type)
+            return NumberNode(token)
+        if token.type == TT_IDENTIFIER:
+            self.eat(TT_IDENTIFIER)
+            return VarAccessNode(token)
+        if token.type == TT_LPAREN:
+            self.eat(TT_LPAREN)
+            node = self.expr()
+            self.eat(TT_RPAREN)
+            return node
+        self.error("Expected INT, FLOAT, IDENTIFIER, or LPAREN")
+
+
+def benchmark_incremental(size=100_000, edits=200):
+    """Latensi edit pada ekspresi ~100 KB: parse penuh versus IncrementalParser"""
+    parts = []
+    length = 0
+    i = 0
+    while length < size:
+        part = f"(a{i} * {i} - b / ({i} + c))"
+        parts.append(part)
+        length += len(part) + 3
+        i += 1
+    text = "total = " + " + ".join(parts)
+    print(f"Benchmark incremental: {len(text)} karakter, {edits} edit")
+    
+    rng = random.Random(0)
+    document = IncrementalParser(text)
+    full_times = []
+    incremental_times = []
+    for _ in range(edits):
+        # Edit kecil: ganti satu digit di posisi acak
+        offset = rng.randrange(len(document.text))
+        while not document.text[offset].isdigit():
+            offset = (offset + 1) % len(document.text)
+        inserted = str(rng.randint(0, 9))
+        
+        start = time.perf_counter()
+        document.edit(offset, 1, inserted)
+        incremental_times.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        parse_text(document.text)
+        full_times.append(time.perf_counter() - start)
+    
+    full_times.sort()
+    incremental_times.sort()
+    for name, times in (("parse penuh", full_times), ("incremental", incremental_times)):
+        median = times[len(times) // 2] * 1000
+        p99 = times[int(len(times) * 0.99) - 1] * 1000
+        print(f"  {name:<12} median {median:8.2f} ms   p99 {p99:8.2f} ms")
+
+
+# ==================== REACTIVE FORMULAS ====================
+
+def dependencies(node):
+    """Kumpulkan nama variabel yang dibaca node (tanpa rekursi)"""
+    names = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BinOpNode):
+            stack.append(current.left_node)
+            stack.append(current.right_node)
+        elif isinstance(current, VarAssignNode):
+            stack.append(current.value_node)
+        elif isinstance(current, VarAccessNode):
+            names.add(current.var_name_token.value)
+    return names
+
+
+class FormulaGraph:
+    """Kumpulan formula assignment ala spreadsheet sebagai graf dependensi.
+    Saat input berubah, hanya formula di hilirnya yang dihitung ulang
+    (urut topologis), bukan seluruh formula"""
+    
+    def __init__(self):
+        self.formulas = {}          # Nama -> CompiledFormula
+        self.dependencies = {}      # Nama -> set nama yang dibaca formulanya
+        self.dependents = {}        # Nama -> set formula yang membacanya
+        self.values = {}
+    
+    def define(self, statement):
+        """Tambah atau ganti formula 'nama = ekspresi' (teks atau
+        VarAssignNode); kembalikan formula yang dihitung ulang"""
+        node = parse_text(statement) if isinstance(statement, str) else statement
+        if not isinstance(node, VarAssignNode):
+            raise FormulaError("Formula harus berupa assignment")
+        name = node.var_name_token.value
+        reads = dependencies(node.value_node)
+        
+        # Graf selalu dijaga tetap asiklik: tolak formula yang menutup siklus
+        cycle = self.find_path(reads, name)
+        if cycle is not None:
+            raise CycleError(f"Dependensi siklik: {' -> '.join([name] + cycle)}")
+        
+        for dependency in self.dependencies.get(name, ()):
+            self.dependents[dependency].discard(name)
+        for dependency in reads:
+            self.dependents.setdefault(dependency, set()).add(name)
+        self.dependencies[name] = reads
+        self.formulas[name] = compile_formula(node)
+        return self.recompute((name,))
+    
+    def update(self, changes):
+        """Ubah nilai input (mapping nama -> nilai) lalu hitung ulang
+        formula di hilirnya saja; kembalikan formula yang dihitung ulang"""
+        for name in changes:
+            if name in self.formulas:
+                raise FormulaError(f"'{name}' adalah formula, bukan input")
+        self.values.update(changes)
+        return self.recompute(changes)
+    
+    def find_path(self, starts, target):
+        """Cari jalur dependensi dari salah satu starts ke target"""
+        parents = {}
+        stack = []
+        for start in starts:
+            if start not in parents:
+                parents[start] = None
+                stack.append(start)
+        while stack:
+            current = stack.pop()
+            if current == target:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1]
+            for dependency in self.dependencies.get(current, ()):
+                if dependency not in parents:
+                    parents[dependency] = current
+                    stack.append(dependency)
+        return None
+    
+    def topological_order(self, names=None):
+        """Urutan topologis (Kahn) untuk names, default seluruh graf"""
+        if names is None:
+            names = self.formulas.keys() | self.dependents.keys()
+        pending = {name: len(self.dependencies.get(name, set()) & names) for name in names}
+        ready = deque(name for name, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in self.dependents.get(name, ()):
+                if dependent in pending:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        ready.append(dependent)
+        if len(order) < len(pending):
+            stuck = sorted(name for name, count in pending.items() if count)
+            raise CycleError(f"Dependensi siklik: {', '.join(stuck)}")
+        return order
+    
+    def recompute(self, changed):
+        """Hitung ulang hanya subgraf hilir dari changed"""
+        dirty = set()
+        stack = list(changed)
+        while stack:
+            name = stack.pop()
+            if name not in dirty:
+                dirty.add(name)
+                stack.extend(self.dependents.get(name, ()))
+        
+        values = self.values
+        recomputed = []
+        for name in self.topological_order(dirty):
+            formula = self.formulas.get(name)
+            if formula is None:
+                continue
+            # Formula dengan dependensi yang belum terdefinisi ikut tidak terdefinisi
+            if self.dependencies[name] <= values.keys():
+                values[name] = formula.function(values)
+            else:
+                values.pop(name, None)
+            recomputed.append(name)
+        return recomputed
+
+
+def benchmark_formula_graph(sizes=(1000, 10000, 50000), chain=10, updates=200):
+    """Biaya update satu input: hitung ulang seluruh formula versus hanya
+    subgraf hilir (rantai sepanjang chain formula per input)"""
+    print(f"Benchmark formula graph: rantai {chain} formula per input, {updates} update")
+    for size in sizes:
+        graph = FormulaGraph()
+        inputs = size // chain
+        graph.update({f"in{i}": 1.0 for i in range(inputs)})
+        for i in range(inputs):
+            previous = f"in{i}"
+            for k in range(chain):
+                name = f"f{i}_{k}"
+                graph.define(f"{name} = {previous} * 2 + in{i} / 3")
+                previous = name
+        
+        order = graph.topological_order()
+        formulas = graph.formulas
+        values = graph.values
+        start = time.perf_counter()
+        for name in order:
+            formula = formulas.get(name)
+            if formula is not None:
+                values[name] = formula.function(values)
+        full = time.perf_counter() - start
+        
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(updates):
+            recomputed = graph.update({f"in{rng.randrange(inputs)}": rng.random()})
+        incremental = (time.perf_counter() - start) / updates
+        print(f"  {size:>6} formula: semua {full * 1000:8.2f} ms   "
+              f"incremental {incremental * 1000:6.3f} ms ({len(recomputed)} formula)")
+
+
+# ==================== COMMON SUBEXPRESSIONS ====================
+
+# Prefix temporary hasil CSE; '$' bukan karakter identifier, jadi namanya
+# tidak mungkin bentrok dengan variabel di formula
+CSE_PREFIX = '$'
+
+
+def count_operations(program):
+    """Jumlah BinOpNode (operasi per baris input) di semua statement"""
+    count = 0
+    stack = list(program.statements)
+    while stack:
+        current = stack.pop()
+        if isinstance(current, BinOpNode):
+            count += 1
+            stack.append(current.left_node)
+            stack.append(current.right_node)
+        elif isinstance(current, VarAssignNode):
+            stack.append(current.value_node)
+    return count
+
+
+def eliminate_common_subexpressions(program):
+    """CSE untuk satu batch statement (ProgramNode). Setiap subtree diberi
+    value number; variabel diberi versi yang naik setiap di-assign, jadi
+    '(a + b)' sebelum dan sesudah 'a = ...' tidak dianggap sama. Operasi yang
+    dipakai di dua tempat atau lebih (dihitung di DAG, bukan per salinan)
+    dihitung sekali ke temporary tepat sebelum statement pertama yang
+    memakainya. Kembalikan (ProgramNode baru, laporan)"""
+    keys = {}           # Kunci struktural -> value number
+    nodes = []          # Value number -> node contoh (token asli)
+    children = []       # Value number -> (kiri, kanan) atau None untuk daun
+    uses = []           # Value number -> jumlah referensi di DAG
+    versions = {}       # Nama variabel -> versi saat ini
+    roots = []          # (statement, value number ekspresinya)
+    
+    def number(key, node, operands=None):
+        value_number = keys.get(key)
+        if value_number is None:
+            value_number = keys[key] = len(nodes)
+            nodes.append(node)
+            children.append(operands)
+            uses.append(0)
+            if operands is not None:
+                for operand in operands:
+                    uses[operand] += 1
+        return value_number
+    
+    for statement in program.statements:
+        node = statement.value_node if isinstance(statement, VarAssignNode) else statement
+        results = []
+        stack = [(node, False)]
+        while stack:
+            current, visited = stack.pop()
+            if isinstance(current, NumberNode):
+                value = current.value
+                results.append(number((NumberNode, value.__class__, repr(value)), current))
+            elif isinstance(current, VarAccessNode):
+                name = current.var_name_token.value
+                results.append(number((VarAccessNode, name, versions.get(name, 0)), current))
+            elif not visited:
+                stack.append((current, True))
+                stack.append((current.right_node, False))
+                stack.append((current.left_node, False))
+            else:
+                right = results.pop()
+                left = results.pop()
+                key = (BinOpNode, current.op_token.type, left, right)
+                results.append(number(key, current, (left, right)))
+        root = results.pop()
+        uses[root] += 1
+        roots.append((statement, root))
+        if isinstance(statement, VarAssignNode):
+            name = statement.var_name_token.value
+            versions[name] = versions.get(name, 0) + 1
+    
+    # Bangun ulang statement; operasi bersama menjadi temporary
+    temporaries = {}    # Value number -> token nama temporary
+    statements = []
+    shared = []
+    for statement, root in roots:
+        results = []
+        stack = [(root, False)]
+        while stack:
+            value_number, visited = stack.pop()
+            operands = children[value_number]
+            if value_number in temporaries:
+                results.append(VarAccessNode(temporaries[value_number]))
+            elif operands is None:
+                results.append(nodes[value_number])
+            elif not visited:
+                stack.append((value_number, True))
+                stack.append((operands[1], False))
+                stack.append((operands[0], False))
+            else:
+                right = results.pop()
+                left = results.pop()
+                node = BinOpNode(left, nodes[value_number].op_token, right)
+                if uses[value_number] > 1:
+                    token = Token(TT_IDENTIFIER, f"{CSE_PREFIX}{len(temporaries)}")
+                    temporaries[value_number] = token
+                    statements.append(VarAssignNode(token, node))
+                    shared.append((token.value, uses[value_number], node))
+                    node = VarAccessNode(token)
+                results.append(node)
+        node = results.pop()
+        if isinstance(statement, VarAssignNode):
+            node = VarAssignNode(statement.var_name_token, node)
+        statements.append(node)
+    
+    optimized = ProgramNode(statements)
+    before = count_operations(program)
+    after = count_operations(optimized)
+    report = {
+        'statements': len(program.statements),
+        'temporaries': len(temporaries),
+        'operations_before': before,
+        'operations_after': after,
+        'eliminated': before - after,
+        'shared': shared,       # (nama temporary, jumlah pemakaian, ekspresi)
+    }
+    return optimized, report
+
+
+def benchmark_cse(statements=500, rows=2000):
+    """Biaya evaluasi per baris input: CompiledProgram batch asli versus
+    batch setelah eliminate_common_subexpressions()"""
+    rng = random.Random(0)
+    shared = ["(a + b)", "(c - d)", "(a + b) * (c - d)", "(b / (c + 1))", "(rate * qty)"]
+    lines = [f"r{i} = {rng.choice(shared)} * {rng.randint(1, 9)} + {rng.choice(shared)} / "
+             f"{rng.randint(1, 9)} - {rng.choice(shared)}" for i in range(statements)]
+    program = parse_program("\n".join(lines))
+    optimized, report = eliminate_common_subexpressions(program)
+    print(f"Benchmark CSE: {statements} statement, {rows} baris input, "
+          f"{report['temporaries']} temporary, operasi {report['operations_before']} -> "
+          f"{report['operations_after']}")
+    
+    inputs = [{'a': i, 'b': 0.5, 'c': i % 7, 'd': 3, 'rate': 1.1, 'qty': i % 13}
+              for i in range(rows)]
+    results = {}
+    for name, batch in (("asli", program), ("CSE", optimized)):
+        compiled = compile_program(batch)
+        start = time.perf_counter()
+        values = [compiled.run(row)[1] for row in inputs]
+        elapsed = time.perf_counter() - start
+        results[name] = values
+        print(f"  {name:<5} {elapsed / rows * 1e6:8.1f} us/baris")
+    
+    assert all(row[f"r{i}"] == optimized_row[f"r{i}"]
+               for row, optimized_row in zip(results["asli"], results["CSE"])
+               for i in range(statements))
+    return report
+
+
+# ==================== TESTING ====================
+
+def test_lexer(text):
+    """Test lexer untuk menampilkan token list"""
+    print(f"\nTokenizing: '{text}'")
+    lexer = FastLexer(text)
+    tokens = []
+    
+    while True:
+        token = lexer.get_next_token()
+        if token.type == TT_EOF:
+            break
+        tokens.append(token)
+    
+    for token in tokens:
+        print(f"  {token}")
+
+def test_parser(text, parser_class=Parser):
+    """Test parser untuk menghasilkan AST"""
+    print(f"\nParsing: '{text}'")
+    
+    try:
+        lexer = FastLexer(text)
+        parser = parser_class(lexer)
+        ast = parser.parse()
+        
+        if ast:
+            print(f"AST: {ast}")
+            return True
+        else:
+            print("❌ Failed to parse")
+            return False
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+
+def test_deep_nesting(depth=10**6):
+    """Test IterativeParser pada kurung dan unary bersarang sedalam depth"""
+    cases = {
+        "kurung": "(" * depth + "x" + ")" * depth,
+        "unary": "- " * depth + "1",
+        "assignment": "y = " + "(-" * depth + "1" + ")" * depth,
+    }
+    for name, text in cases.items():
+        start = time.perf_counter()
+        ast = IterativeParser(FastLexer(text)).parse()
+        elapsed = time.perf_counter() - start
+        status = "OK" if ast is not None else "GAGAL"
+        print(f"  {name:<10} kedalaman {depth}: {status} ({elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("LEXER & PARSER DENGAN VARIABLE ASSIGNMENT")
+    print("=" * 60)
+    
+    # Test Lexer
+    print("\n" + "="*30 + " LEXER TESTS " + "="*30)
+    test_lexer("a = 100")
+    test_lexer("x = 10 + y * 2")
+    test_lexer("_var123 = (a + b) * c")
+    test_lexer("3.14 + 2.5")
+    
+    # Test Parser
+    print("\n" + "="*30 + " PARSER TESTS " + "="*30)
+    
+    # Test 1: Simple assignment
+    print("\n1. Simple Assignment:")
+    test_parser("a = 100")
+    
+    # Test 2: Assignment dengan ekspresi
+    print("\n2. Assignment dengan Ekspresi:")
+    test_parser("x = 10 + 20")
+    
+    # Test 3: Access variable dalam ekspresi
+    print("\n3. Access Variable:")
+    test_parser("a + 5")
+    
+    # Test 4: Assignment dengan variable lain
+    print("\n4. Assignment dengan Variable:")
+    test_parser("y = x * 2")
+    
+    # Test 5: Complex expression
+    print("\n5. Complex Expression:")
+    test_parser("result = (a + b) * (c - d) / 2")
+    
+    # Test 6: Multiple operations
+    print("\n6. Multiple Operations:")
+    test_parser("total = price * quantity + tax")
+    
+    # Test 7: Float numbers
+    print("\n7. Float Numbers:")
+    test_parser("pi = 3.14")
+    test_parser("radius = 5.0")
+    test_parser("area = pi * radius * radius")
+    
+    # Test 8: Variable names dengan underscore
+    print("\n8. Variable dengan Underscore:")
+    test_parser("_temp = _value1 + _value2")
+    
+    # Test 9: Error cases
+    print("\n9. Error Cases:")
+    test_parser("= 100")  # Missing identifier
+    test_parser("a = ")   # Missing value
+    test_parser("123 = x") # Number sebagai identifier
+    
+    # Test 10: Parser iteratif untuk nesting sangat dalam
+    print("\n10. Iterative Parser:")
+    test_parser("z = -(a + b) * -c", IterativeParser)
+    test_deep_nesting()
+    
+    # Test 11: Compile AST menjadi fungsi Python
+    print("\n11. Compiled Formula:")
+    formula_ast = Parser(FastLexer("area = pi * radius * radius")).parse()
+    formula = compile_formula(formula_ast)
+    print(f"  {formula} -> {formula({'pi': 3.14, 'radius': 5.0})}")
+    
+    if np is not None:
+        columns = {'pi': np.array([3.14, 3.14]), 'radius': np.array([1, 5])}
+        print(f"  Kolom: {evaluate_columns(formula_ast, columns)}")
+    
+    # Test 12: Subtree identik dipakai bersama
+    print("\n12. Hash-Consing:")
+    factory = HashConsFactory()
+    first = parse_text("x = (a + b) * 2", factory=factory)
+    second = parse_text("y = (a + b) / 3", factory=factory)
+    print(f"  (a + b) dipakai bersama: {first.value_node.left_node is second.value_node.left_node}")
+    
+    # Test 13: Constant folding
+    print("\n13. Constant Folding:")
+    folded, removed = fold_constants(parse_text("luas = 2 * 3.14 * r * 1 - -(4 / 2)"))
+    print(f"  {folded} ({removed} node dihapus)")
+    verify_constant_folding()
+    
+    # Test 14: Edit incremental
+    print("\n14. Incremental Parsing:")
+    document = IncrementalParser("total = price * quantity + tax")
+    print(f"  {document.edit(8, 5, 'harga')}")
+    
+    # Test 15: Program multi-statement
+    print("\n15. Program Mode:")
+    program = compile_program(parse_program("pi = 3.14; r = d / 2\narea = pi * r * r"))
+    print(f"  {program} -> {program.run({'d': 10})}")
+    
+    # Test 16: Formula reaktif
+    print("\n16. Reactive Formulas:")
+    graph = FormulaGraph()
+    graph.define("area = pi * radius * radius")
+    graph.define("pi = 3.14")
+    graph.update({'radius': 2})
+    print(f"  radius = 2 -> area = {graph.values['area']}")
+    print(f"  radius = 3 -> dihitung ulang {graph.update({'radius': 3})}, area = {graph.values['area']}")
+    try:
+        graph.define("radius = area / pi")
+    except Exception as e:
+        print(f"  Error: {e}")
+    
+    # Test 17: Format AST biner
+    print("\n17. Binary AST Format:")
+    library = ASTLibrary(dumps_ast([parse_text("area = pi * r * r"), parse_text("2.5 * -x")]))
+    print(f"  {library}: {list(library)}")
+    verify_ast_serialization()
+    
+    # Test 18: AST datar (postfix)
+    print("\n18. Flat AST:")
+    flat = parse_flat("luas = -2 * pi * (r + 1)")
+    print(f"  {flat} -> {flat.evaluate({'pi': 3.14, 'r': 1})}")
+    print(f"  {flat.to_node()}")
+    verify_flat_ast()
+    
+    # Test 19: Semua error dalam satu pass
+    print("\n19. Error Recovery:")
+    for diagnostic in diagnose_program("a = 10 + * 2; b = (x $ 1\n= 100\nc = y z"):
+        print(f"  {diagnostic}")
+    
+    # Test 20: Counter dan timer lexer/parser
+    print("\n20. Instrumentation:")
+    _, profile = profile_parse(["luas = pi * (r + 1) * (r + 1)", "x = -harga * 2.5"],
+                               lexer_class=Lexer)
+    print(f"  {profile}")
+    print(f"  Token: {dict(profile.tokens)}")
+    for name, (calls, seconds) in profile.methods.items():
+        print(f"  {name:<16} {calls:>4} panggilan  {seconds * 1e6:8.1f} us")
+    
+    # Test 21: Backend angka
+    print("\n21. Numeric Backends:")
+    for backend in (FLOAT_BACKEND, decimal_backend(), FRACTION_BACKEND):
+        formula = compile_numeric("selisih = 0.1 + 0.2 - 0.3 + harga / 3", backend)
+        print(f"  {backend.name:<9} {formula({'harga': 1})!r}")
+    
+    # Test 22: Subexpression bersama di banyak formula
+    print("\n22. Common Subexpressions:")
+    batch, report = eliminate_common_subexpressions(parse_program(
+        "result = (a + b) * (c - d) / 2\nmargin = (a + b) - (c - d)\na = 1\nnext = a + b"))
+    for statement in batch.statements:
+        print(f"  {statement}")
+    print(f"  Operasi per baris: {report['operations_before']} -> {report['operations_after']}")
+    
+    if "--benchmark" in sys.argv:
+        benchmark_compile()
+        benchmark_program()
+        benchmark_columns()
+        benchmark_parse_cache()
+        benchmark_hash_consing()
+        benchmark_incremental()
+        benchmark_lookahead()
+        benchmark_formula_graph()
+        benchmark_ast_format()
+        benchmark_flat_ast()
+        benchmark_diagnose()
+        benchmark_instrumentation()
+        benchmark_numeric()
+        benchmark_cse()
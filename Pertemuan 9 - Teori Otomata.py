@@ -1,4 +1,19 @@
+import codecs
+import io
+import mmap
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+
 class Token:
+    __slots__ = ('type', 'value')
+    
     def __init__(self, type, value):
         self.type = type
         self.value = value
@@ -7,6 +22,10 @@ class Token:
         return f"Token({self.type}, '{self.value}')"
 
 
+class LexerError(Exception):
+    """Karakter yang tidak dikenali lexer"""
+
+
 class Lexer:
     def __init__(self, text):
         self.text = text
@@ -72,15 +91,125 @@ class Lexer:
                 return Token('RPAREN', ')')
             
             # Jika karakter tidak dikenali
-            raise Exception(f"Karakter tidak valid: '{self.current_char}'")
+            raise LexerError(f"Karakter tidak valid: '{self.current_char}'")
         
         # End of file
         return Token('EOF', None)
 
 
-def tokenize_expression(expression):
-    """Fungsi untuk menghasilkan list token dari ekspresi"""
-    lexer = Lexer(expression)
+# Pola master: lewati spasi, lalu tangkap integer (grup 1) atau operator (grup 2)
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+)|([-+*/()]))')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+OPERATOR_TYPES = {
+    '+': 'PLUS',
+    '-': 'MINUS',
+    '*': 'MUL',
+    '/': 'DIV',
+    '(': 'LPAREN',
+    ')': 'RPAREN',
+}
+
+# Token operator bersifat tetap, jadi cukup satu instance per operator
+OPERATOR_TOKENS = {char: Token(type, char) for char, type in OPERATOR_TYPES.items()}
+
+
+class FastLexer:
+    """Lexer berbasis regex: satu match per token, lexeme diambil langsung
+    dengan slicing dari teks sumber (tanpa advance() per karakter)"""
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+    
+    def error(self):
+        """Cari karakter tidak valid setelah spasi, atau kembalikan EOF"""
+        pos = WHITESPACE_PATTERN.match(self.text, self.pos).end()
+        self.pos = pos
+        if pos >= len(self.text):
+            return Token('EOF', None)
+        raise LexerError(f"Karakter tidak valid: '{self.text[pos]}'")
+    
+    def get_next_token(self):
+        """Tokenizer (Lexical Analyzer) dengan satu regex match per token"""
+        match = TOKEN_PATTERN.match(self.text, self.pos)
+        if match is None:
+            return self.error()
+        
+        self.pos = match.end()
+        number, operator = match.groups()
+        if number is not None:
+            return Token('INTEGER', int(number))
+        return OPERATOR_TOKENS[operator]
+
+
+# Kode tipe integer kecil untuk representasi kolom (TokenArray)
+TYPE_NAMES = ('INTEGER', 'PLUS', 'MINUS', 'MUL', 'DIV', 'LPAREN', 'RPAREN', 'EOF')
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+OPERATOR_CODES = {char: TYPE_CODES[type] for char, type in OPERATOR_TYPES.items()}
+
+# Pola untuk scan kolom: integer (grup 1), operator (grup 2), karakter lain (grup 3)
+SCAN_PATTERN = re.compile(r'(\d+)|([-+*/()])|(\S)')
+
+
+class TokenArray:
+    """Token dalam bentuk kolom: kode tipe serta offset awal/akhir disimpan
+    di buffer array paralel; objek Token baru dibuat saat diakses"""
+    __slots__ = ('text', 'types', 'starts', 'ends')
+    
+    def __init__(self, text):
+        self.text = text
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+    
+    def __len__(self):
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        """Materialisasi satu token dari kolom"""
+        lexeme = self.text[self.starts[index]:self.ends[index]]
+        if isinstance(lexeme, bytes):   # Sumber berupa mmap (tokenize_file)
+            lexeme = lexeme.decode()
+        if self.types[index] == TYPE_CODES['INTEGER']:
+            return Token('INTEGER', int(lexeme))
+        return OPERATOR_TOKENS[lexeme]
+    
+    def __repr__(self):
+        return f"TokenArray({len(self)} token)"
+    
+    def nbytes(self):
+        """Ukuran buffer kolom dalam byte (tanpa teks sumber)"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.types, self.starts, self.ends))
+
+
+def tokenize_columnar(expression):
+    """Tokenisasi langsung ke TokenArray tanpa membuat objek Token"""
+    tokens = TokenArray(expression)
+    types_append = tokens.types.append
+    starts_append = tokens.starts.append
+    ends_append = tokens.ends.append
+    integer_code = TYPE_CODES['INTEGER']
+    
+    for match in SCAN_PATTERN.finditer(expression):
+        group = match.lastindex
+        if group == 3:
+            raise LexerError(f"Karakter tidak valid: '{match.group()}'")
+        types_append(integer_code if group == 1 else OPERATOR_CODES[match.group()])
+        start, end = match.span()
+        starts_append(start)
+        ends_append(end)
+    
+    return tokens
+
+
+def tokenize_expression(expression, lexer_class=FastLexer, columnar=False):
+    """Fungsi untuk menghasilkan list token dari ekspresi
+    (atau TokenArray jika columnar=True)"""
+    if columnar:
+        return tokenize_columnar(expression)
+    
+    lexer = lexer_class(expression)
     tokens = []
     
     while True:
@@ -93,6 +222,208 @@ def tokenize_expression(expression):
     return tokens[:-1]
 
 
+# Ukuran chunk default untuk streaming (64 KB)
+CHUNK_SIZE = 1 << 16
+
+
+def stream_tokens(source, chunk_size=CHUNK_SIZE):
+    """Generator token dari file object (teks/biner) atau mmap, dibaca per
+    chunk sehingga memori tetap konstan berapapun ukuran input"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    eof = False
+    
+    while not eof:
+        chunk = source.read(chunk_size)
+        eof = not chunk
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk, final=eof)
+        buffer += chunk
+        
+        pos = 0
+        end = len(buffer)
+        while True:
+            match = TOKEN_PATTERN.match(buffer, pos)
+            if match is None:
+                pos = WHITESPACE_PATTERN.match(buffer, pos).end()
+                if pos < end:
+                    raise LexerError(f"Karakter tidak valid: '{buffer[pos]}'")
+                break
+            
+            # Lexeme yang menyentuh akhir buffer mungkin terpotong di batas
+            # chunk; simpan dan lanjutkan setelah chunk berikutnya dibaca
+            if match.end() == end and not eof:
+                break
+            
+            pos = match.end()
+            number, operator = match.groups()
+            if number is not None:
+                yield Token('INTEGER', int(number))
+            else:
+                yield OPERATOR_TOKENS[operator]
+        
+        # Hanya sisa lexeme yang belum lengkap yang dibawa ke chunk berikutnya
+        buffer = buffer[pos:]
+
+
+# Versi bytes dari SCAN_PATTERN untuk scan langsung di atas mmap (ASCII)
+BYTE_SCAN_PATTERN = re.compile(rb'(\d+)|([-+*/()])|(\S)')
+BYTE_OPERATOR_CODES = {ord(char): code for char, code in OPERATOR_CODES.items()}
+WHITESPACE_BYTES = re.compile(rb'\s')
+
+# Ukuran minimal satu chunk paralel (1 MB) dan jumlah chunk per worker
+MIN_PARALLEL_CHUNK = 1 << 20
+CHUNKS_PER_WORKER = 4
+
+
+def chunk_bounds(buffer, count):
+    """Bagi buffer menjadi maksimal count rentang (start, end); batas digeser
+    ke spasi/newline berikutnya agar tidak ada token yang terpotong"""
+    size = len(buffer)
+    bounds = []
+    start = 0
+    for k in range(1, count):
+        match = WHITESPACE_BYTES.search(buffer, max(start, size * k // count))
+        if match is None:
+            break
+        if match.start() > start:
+            bounds.append((start, match.start()))
+            start = match.start()
+    bounds.append((start, size))
+    return bounds
+
+
+def scan_columns(buffer, start, end):
+    """Tokenisasi buffer[start:end] langsung ke kolom array tanpa menyalin
+    teks; offset yang dihasilkan global terhadap buffer"""
+    types = array('B')
+    starts = array('q')
+    ends = array('q')
+    types_append = types.append
+    starts_append = starts.append
+    ends_append = ends.append
+    integer_code = TYPE_CODES['INTEGER']
+    
+    for match in BYTE_SCAN_PATTERN.finditer(buffer, start, end):
+        group = match.lastindex
+        token_start, token_end = match.span()
+        if group == 3:
+            char = bytes(buffer[token_start:token_start + 4]).decode('utf-8', 'replace')[0]
+            raise LexerError(f"Karakter tidak valid: '{char}'")
+        types_append(integer_code if group == 1 else BYTE_OPERATOR_CODES[buffer[token_start]])
+        starts_append(token_start)
+        ends_append(token_end)
+    
+    return types, starts, ends
+
+
+def tokenize_chunk(path, start, end):
+    """Worker: mmap file (halaman dibagi bersama lewat page cache), scan satu
+    chunk, dan kirim kolomnya sebagai bytes"""
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        return tuple(column.tobytes() for column in scan_columns(buffer, start, end))
+
+
+def tokenize_file(path, workers=None, chunks_per_worker=CHUNKS_PER_WORKER):
+    """Tokenisasi file besar (misal jutaan ekspresi per baris) secara paralel
+    menjadi satu TokenArray dengan offset byte global. Input diperlakukan
+    sebagai bytes (digit dan spasi ASCII); TokenArray memakai mmap file
+    sebagai teks sumber, jadi isi file tidak pernah disalin ke str"""
+    workers = workers or os.cpu_count() or 1
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return TokenArray(b'')
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    tokens = TokenArray(buffer)
+    count = min(workers * chunks_per_worker, len(buffer) // MIN_PARALLEL_CHUNK)
+    if workers == 1 or count <= 1:
+        tokens.types, tokens.starts, tokens.ends = scan_columns(buffer, 0, len(buffer))
+        return tokens
+    
+    bounds = chunk_bounds(buffer, count)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(tokenize_chunk, *zip(*((path, start, end) for start, end in bounds)))
+        for types, starts, ends in chunks:
+            tokens.types.frombytes(types)
+            tokens.starts.frombytes(starts)
+            tokens.ends.frombytes(ends)
+    return tokens
+
+
+def benchmark_lexer(size=100000, repeat=3):
+    """Bandingkan waktu Lexer per-karakter dengan FastLexer"""
+    expression = " + ".join(f"({i} * {i + 12345})" for i in range(size))
+    print(f"Benchmark lexer: {len(expression)} karakter")
+    
+    results = {}
+    for lexer_class in (Lexer, FastLexer):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokens = tokenize_expression(expression, lexer_class)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[lexer_class.__name__] = best
+        print(f"  {lexer_class.__name__:<10} {best:.3f} s  ({len(tokens)} token)")
+    
+    print(f"  Speedup: {results['Lexer'] / results['FastLexer']:.1f}x")
+    return results
+
+
+def benchmark_memory(size=100000):
+    """Ukur memori puncak list Token versus TokenArray dengan tracemalloc"""
+    expression = " + ".join(f"({i} * {i + 12345})" for i in range(size))
+    print(f"Benchmark memori: {len(expression)} karakter")
+    
+    cases = (
+        ("Lexer", lambda: tokenize_expression(expression, Lexer)),
+        ("FastLexer", lambda: tokenize_expression(expression, FastLexer)),
+        ("TokenArray", lambda: tokenize_expression(expression, columnar=True)),
+    )
+    results = {}
+    for name, run in cases:
+        tracemalloc.start()
+        tokens = run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = peak
+        print(f"  {name:<10} {peak / 1024 / 1024:8.2f} MB puncak  ({len(tokens)} token)")
+        del tokens
+    
+    return results
+
+
+def benchmark_parallel(lines=1_000_000, worker_counts=(1, 2, 4, 8)):
+    """Skalabilitas tokenize_file() pada file berisi ekspresi per baris"""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        for i in range(lines):
+            file.write(f"({i} + {i % 97}) * {i % 13 + 1} - {i // 7}\n")
+        path = file.name
+    size = os.path.getsize(path)
+    print(f"Benchmark tokenisasi paralel: {lines} baris, {size / 1024 / 1024:.1f} MB, "
+          f"{os.cpu_count()} CPU")
+    
+    try:
+        with open(path) as file:
+            text = file.read()
+        start = time.perf_counter()
+        expected = tokenize_columnar(text)
+        serial = time.perf_counter() - start
+        print(f"  {'tokenize_columnar':<18} {len(expected) / serial:12.0f} token/detik")
+        
+        for workers in worker_counts:
+            start = time.perf_counter()
+            tokens = tokenize_file(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert tokens.starts == expected.starts and tokens.types == expected.types
+            label = f"workers={workers}"
+            print(f"  {label:<18} {len(tokens) / elapsed:12.0f} token/detik  "
+                  f"({serial / elapsed:.2f}x)")
+    finally:
+        os.remove(path)
+
+
 # Test dengan contoh input
 if __name__ == "__main__":
     test_expression = "(10 + 2 ) * 5"
@@ -110,4 +441,18 @@ if __name__ == "__main__":
     # Token(INTEGER, 2)
     # Token(RPAREN, ')')
     # Token(MUL, '*')
-    # Token(INTEGER, 5)
\ No newline at end of file
+    # Token(INTEGER, 5)
+    
+    # Mode streaming: token dibaca bertahap dari file object
+    print("\nStreaming Token List:")
+    for token in stream_tokens(io.StringIO(test_expression), chunk_size=4):
+        print(token)
+    
+    # Mode kolom: kode tipe dan offset dalam buffer array
+    columns = tokenize_expression(test_expression, columnar=True)
+    print(f"\nColumnar: {columns}, types={columns.types.tolist()}")
+    
+    if "--benchmark" in sys.argv:
+        benchmark_lexer()
+        benchmark_memory()
+        benchmark_parallel()
\ No newline at end of file